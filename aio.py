@@ -0,0 +1,221 @@
+# aio.py - asyncio front end for the Tasky data layer
+# Every call is handed to one dedicated database thread, so coroutines never
+# block the event loop on SQLite and all of them share that thread's single
+# connection. Calls are queued as soon as they are awaited (pipelined) and
+# run strictly in the order they were submitted.
+#
+#   import aio
+#   task_id = await aio.add_task("Write report")
+#   tasks = await aio.list_tasks()
+
+if __name__ == "__main__":
+    # Self-check: importing tasks below migrates ./tasks.db, so move to a
+    # throwaway directory first - it must never touch the real database
+    import os
+    import tempfile
+    os.chdir(tempfile.mkdtemp(prefix="tasky_aio_"))
+
+import asyncio
+import atexit
+import functools
+import queue
+import threading
+import time
+from itertools import islice
+
+import tasks
+import planner_db
+from database import close_thread_connections
+
+# ============================================================================
+# DATABASE THREAD
+# ============================================================================
+
+DELIVER_EVERY = 0.005  # Seconds of finished calls handed to the event loop at once
+
+_calls = queue.SimpleQueue()  # (loop, future, call) in submission order; None stops
+_thread = None
+_thread_lock = threading.Lock()
+
+def _deliver(outcomes):
+    """Resolve finished calls' futures (runs on the event loop)"""
+    for future, result, error in outcomes:
+        if future.done():
+            continue  # The awaiting coroutine was cancelled
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+def _flush(finished):
+    for loop, outcomes in finished.items():
+        try:
+            loop.call_soon_threadsafe(_deliver, outcomes)
+        except RuntimeError:
+            pass  # That event loop has already closed
+    finished.clear()
+
+def _serve():
+    """Database thread: run calls in order, hand results back in batches
+
+    Waking the event loop once per batch rather than once per call keeps a
+    burst of requests (e.g. gather() over thousands of writes) from
+    stalling it while the results come in.
+    """
+    finished = {}  # loop -> [(future, result, error)]
+    flushed = time.monotonic()
+    while True:
+        item = _calls.get()
+        if item is None:
+            break
+        loop, future, call = item
+        if future.cancelled():
+            continue  # Given up on before it started
+        try:
+            outcome = (future, call(), None)
+        except BaseException as e:
+            outcome = (future, None, e)
+        finished.setdefault(loop, []).append(outcome)
+
+        if _calls.empty() or time.monotonic() - flushed >= DELIVER_EVERY:
+            _flush(finished)
+            flushed = time.monotonic()
+    _flush(finished)
+    close_thread_connections()
+
+def run(func, *args, **kwargs):
+    """Run a blocking data-layer function on the database thread.
+
+    Returns an awaitable; the call is queued immediately, so several
+    coroutines can have requests in flight at once.
+    """
+    global _thread
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    with _thread_lock:
+        if _thread is None:
+            # Daemon, so a forgotten shutdown() can't hang interpreter exit
+            _thread = threading.Thread(target=_serve, name="tasky-db", daemon=True)
+            _thread.start()
+    _calls.put((loop, future, functools.partial(func, *args, **kwargs)))
+    return future
+
+def shutdown():
+    """Finish queued calls, close the database thread's connection and stop it"""
+    global _thread
+    with _thread_lock:
+        thread, _thread = _thread, None
+    if thread is not None:
+        _calls.put(None)
+        thread.join()
+
+atexit.register(shutdown)
+
+def _wrap(func):
+    """Async version of a blocking data-layer function"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run(func, *args, **kwargs)
+    return wrapper
+
+# ============================================================================
+# TASKS
+# ============================================================================
+
+add_task = _wrap(tasks.add_task)
+add_tasks = _wrap(tasks.add_tasks)
+list_tasks = _wrap(tasks.list_tasks)
+list_all_tasks = _wrap(tasks.list_all_tasks)
+list_tasks_page = _wrap(tasks.list_tasks_page)
+list_all_tasks_page = _wrap(tasks.list_all_tasks_page)
+get_unfinished_tasks = _wrap(tasks.get_unfinished_tasks)
+mark_done = _wrap(tasks.mark_done)
+mark_done_many = _wrap(tasks.mark_done_many)
+start_task = _wrap(tasks.start_task)
+start_many = _wrap(tasks.start_many)
+delete_task = _wrap(tasks.delete_task)
+delete_many = _wrap(tasks.delete_many)
+hide_incomplete_tasks = _wrap(tasks.hide_incomplete_tasks)
+unhide_all_tasks = _wrap(tasks.unhide_all_tasks)
+set_task_hidden = _wrap(tasks.set_task_hidden)
+get_hidden_count = _wrap(tasks.get_hidden_count)
+is_task_hidden = _wrap(tasks.is_task_hidden)
+search_tasks = _wrap(tasks.search_tasks)
+get_task_statistics = _wrap(tasks.get_task_statistics)
+get_duration_percentiles = _wrap(tasks.get_duration_percentiles)
+get_range_performance = _wrap(tasks.get_range_performance)
+get_daily_performance = _wrap(tasks.get_daily_performance)
+get_weekly_performance = _wrap(tasks.get_weekly_performance)
+get_monthly_performance = _wrap(tasks.get_monthly_performance)
+get_streak_info = _wrap(tasks.get_streak_info)
+get_analytics_snapshot = _wrap(tasks.get_analytics_snapshot)
+rebuild_daily_stats = _wrap(tasks.rebuild_daily_stats)
+archive_completed_batch = _wrap(tasks.archive_completed_batch)
+get_archive_age = _wrap(tasks.get_archive_age)
+set_archive_age = _wrap(tasks.set_archive_age)
+
+def _next_batch(rows, size):
+    return list(islice(rows, size))
+
+async def iter_tasks(include_hidden=False, include_done=False, batch_size=tasks.PAGE_SIZE, columns=None):
+    """Async generator over tasks, newest first, fetched batch_size at a time"""
+    rows = await run(tasks.iter_tasks, include_hidden, include_done, batch_size, columns)
+    try:
+        while True:
+            batch = await run(_next_batch, rows, batch_size)
+            if not batch:
+                return
+            for task in batch:
+                yield task
+    finally:
+        # Finish the generator on the thread that owns its cursor
+        await run(rows.close)
+
+# ============================================================================
+# PLANS
+# ============================================================================
+
+add_plan = _wrap(planner_db.add_plan)
+list_plans = _wrap(planner_db.list_plans)
+update_plan = _wrap(planner_db.update_plan)
+delete_plan = _wrap(planner_db.delete_plan)
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+async def _check_event_loop(n=2000, max_stall_ms=100):
+    """Concurrent writers and readers while a ticker measures loop stalls
+
+    Fails if the loop ever stalls longer than max_stall_ms. Some stall is
+    the gather() itself - asyncio spends ~10 us setting up each task.
+    """
+    worst_lag = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal worst_lag
+        loop = asyncio.get_running_loop()
+        while running:
+            before = loop.time()
+            await asyncio.sleep(0.005)
+            worst_lag = max(worst_lag, loop.time() - before - 0.005)
+
+    tick = asyncio.create_task(ticker())
+    ids = await asyncio.gather(*(add_task(f"Async task {i}") for i in range(n)))
+    await asyncio.gather(*(mark_done(i) for i in ids[::2]), get_task_statistics())
+    streamed = [task.id async for task in iter_tasks(include_done=True, columns=("status",))]
+    await delete_many(ids)
+    running = False
+    await tick
+
+    print(f"{n} concurrent adds, {len(streamed)} streamed, worst loop stall {worst_lag * 1000:.1f} ms")
+    return len(set(ids)) == n and set(ids) <= set(streamed) and worst_lag * 1000 <= max_stall_ms
+
+if __name__ == "__main__":
+    import sys
+
+    ok = asyncio.run(_check_event_loop())
+    shutdown()
+    print("✓ Async data layer OK" if ok else "✗ Async data layer FAILED")
+    sys.exit(0 if ok else 1)
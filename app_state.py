@@ -2,6 +2,7 @@
 # UPDATED: Added auto-refresh tracking for main window + hidden tasks for refresh button
 
 from datetime import datetime
+from events import subscribe, DELETED, HIDDEN, SHOWN
 
 class AppState:
     """Central store for all application state"""
@@ -20,6 +21,7 @@ class AppState:
     # Date tracking
     last_refresh_date = None       # Track last analytics refresh
     last_main_refresh_date = None  # Track last main window refresh
+    analytics_stale = False        # A task changed since analytics were built
     
     # Task display state
     active_buttons = None          # Which task card has buttons visible
@@ -56,13 +58,27 @@ class AppState:
         """Check if analytics need refresh (daily)
         
         Returns:
-            bool: True if we've crossed into a new day since last analytics refresh
+            bool: True if we've crossed into a new day, or a task changed,
+                  since last analytics refresh
         """
         today = datetime.now().date()
+        stale, cls.analytics_stale = cls.analytics_stale, False
         if cls.last_refresh_date != today:
             cls.last_refresh_date = today
             return True
-        return False
+        return stale
+    
+    @classmethod
+    def on_task_change(cls, event):
+        """Keep task-derived state current (subscribed to task change events)"""
+        cls.analytics_stale = True
+        if event.kind == SHOWN and not event.ids:
+            cls.hidden_tasks = []
+        elif event.kind == HIDDEN:
+            for task_id in event.ids:
+                cls.hide_task(task_id)
+        elif event.kind == DELETED:
+            cls.hidden_tasks = [tid for tid in cls.hidden_tasks if tid not in event.ids]
     
     # ===== NEW: Hidden Tasks Methods =====
     @classmethod
@@ -90,15 +106,13 @@ class AppState:
     def hide_all_incomplete_tasks(cls, tasks):
         """Hide all incomplete tasks from a list of tasks
         Args:
-            tasks: List of tasks from list_tasks() where each task has structure:
-                   (id, title, description, status, category, priority, created_at, started_at, completed_at)
+            tasks: Task records from list_tasks() (needs id and status)
         """
         hidden_count = 0
         for task in tasks:
-            # task[3] is status, task[0] is id
-            if task[3] != "Done":  # If task is not completed
-                if task[0] not in cls.hidden_tasks:
-                    cls.hidden_tasks.append(task[0])
+            if task.status != "Done":  # If task is not completed
+                if task.id not in cls.hidden_tasks:
+                    cls.hidden_tasks.append(task.id)
                     hidden_count += 1
         return hidden_count
     
@@ -127,6 +141,7 @@ class AppState:
         cls.active_buttons = None
         cls.rebind_scrolling_func = None
         cls.hidden_tasks = []  # Reset hidden tasks
+        cls.analytics_stale = False
         cls.init()
     
     @classmethod
@@ -147,6 +162,7 @@ class AppState:
 
 # Auto-initialize when imported
 AppState.init()
+subscribe(AppState.on_task_change, entity="task")
 
 # ============================================================================
 # GLOBAL APP CONTROL FUNCTIONS (SET BY GUI)
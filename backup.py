@@ -1,7 +1,6 @@
 # backup.py - Automatic database backup system with CLI tools
 # Place this file in the same folder as tasks.db
 
-import shutil
 import os
 from datetime import datetime, timedelta
 import sqlite3
@@ -13,6 +12,8 @@ import sqlite3
 BACKUP_DIR = "backups"
 DB_FILE = "tasks.db"
 MAX_BACKUP_DAYS = 7
+BACKUP_STEP_PAGES = 256     # Pages copied per backup step (1 MB at 4 KB pages)
+BUSY_TIMEOUT = 5            # Seconds to wait for a lock
 
 # ============================================================================
 # CORE BACKUP FUNCTIONS
@@ -29,8 +30,44 @@ def get_backup_filename():
     date_str = datetime.now().strftime("%Y-%m-%d")
     return f"tasks_backup_{date_str}.db"
 
-def create_backup():
-    """Copy current database to backup folder"""
+def copy_database(source_path, target_path, progress=None):
+    """Consistent copy of a live database with the SQLite backup API
+    
+    The source keeps one read transaction open for the whole copy. In WAL
+    mode that pins a single snapshot without ever blocking writers, and the
+    copy never restarts when another connection commits meanwhile. The copy
+    is written next to target_path and renamed into place, so a failure
+    never leaves a half-written backup behind.
+    
+    Args:
+        progress: Optional progress(status, remaining, total) called after
+                  every step of BACKUP_STEP_PAGES pages
+    """
+    tmp_path = target_path + ".tmp"
+    source = sqlite3.connect(source_path, timeout=BUSY_TIMEOUT)
+    target = sqlite3.connect(tmp_path)
+    try:
+        source.execute("BEGIN")
+        source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()  # Takes the snapshot
+        source.backup(target, pages=BACKUP_STEP_PAGES, progress=progress, sleep=0)
+        source.rollback()
+        
+        # A backup is one self-contained file, no -wal beside it
+        target.execute("PRAGMA journal_mode = DELETE")
+        check = target.execute("PRAGMA quick_check").fetchone()[0]
+        if check != "ok":
+            raise sqlite3.DatabaseError(f"backup failed quick_check: {check}")
+    except BaseException:
+        target.close()
+        source.close()
+        os.remove(tmp_path)
+        raise
+    target.close()
+    source.close()
+    os.replace(tmp_path, target_path)
+
+def create_backup(progress=None):
+    """Copy current database to backup folder (see copy_database)"""
     ensure_backup_dir()
     
     # Check if database exists
@@ -46,13 +83,7 @@ def create_backup():
         return True
     
     try:
-        # Quick verification that database is not corrupted
-        conn = sqlite3.connect(DB_FILE)
-        conn.execute("SELECT COUNT(*) FROM tasks")
-        conn.close()
-        
-        # Copy the file
-        shutil.copy2(DB_FILE, backup_path)
+        copy_database(DB_FILE, backup_path, progress)
         print(f"[Backup] Created: {backup_path}")
         
         # Clean old backups
@@ -131,11 +162,18 @@ def restore_backup(backup_filename):
         # Create backup of current db before restoring (just in case)
         if os.path.exists(DB_FILE):
             emergency_backup = f"{DB_FILE}.before_restore"
-            shutil.copy2(DB_FILE, emergency_backup)
+            copy_database(DB_FILE, emergency_backup)
             print(f"[Restore] Current database backed up to: {emergency_backup}")
         
-        # Restore from backup
-        shutil.copy2(backup_path, DB_FILE)
+        # Restore through the backup API too: copying a file over tasks.db
+        # would leave its -wal file to be replayed on top of the restore
+        source = sqlite3.connect(backup_path)
+        target = sqlite3.connect(DB_FILE, timeout=BUSY_TIMEOUT)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
         print(f"[Restore] Successfully restored from: {backup_filename}")
         return True
     except Exception as e:
@@ -177,7 +215,12 @@ if __name__ == "__main__":
     
     elif command == "backup":
         print("\n📀 Creating manual backup...")
-        create_backup()
+        
+        def show_progress(status, remaining, total):
+            done = (total - remaining) / total * 100 if total else 100
+            print(f"\r  {done:5.1f}% of {total} pages", end="" if remaining else "\n")
+        
+        create_backup(show_progress)
     
     elif command == "restore":
         if len(sys.argv) > 2:
@@ -0,0 +1,323 @@
+# benchmark.py - Timing harness for the Tasky data layer
+# Always runs against a throwaway database in a temp folder, never tasks.db
+#
+#   python benchmark.py bulk     - per-row cost of one-by-one vs bulk writes
+#   python benchmark.py cache    - refresh reads with and without the query cache
+#   python benchmark.py refresh  - card data for a refresh, per-card lookup vs batched
+#   python benchmark.py archive  - open-task reads before/after archiving old history
+#   python benchmark.py vacuum   - file size and backup copy time before/after maintenance
+#   python benchmark.py backup   - file copy vs backup API while another thread writes
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+# tasks.py opens "tasks.db" in the working directory on import
+os.chdir(tempfile.mkdtemp(prefix="tasky_bench_"))
+
+import tasks
+import maintenance
+import backup
+from database import checkpoint
+
+def timed(func, *args):
+    """Run func once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def reset_tasks():
+    """Empty the tasks tables between runs"""
+    conn = tasks.get_connection(tasks.DB_FILE)
+    conn.execute("DELETE FROM tasks")
+    conn.execute("DELETE FROM tasks_archive")
+    conn.commit()
+    tasks.cache.invalidate()
+
+# ============================================================================
+# BULK WRITES
+# ============================================================================
+
+BULK_SIZES = [10, 1_000, 100_000]
+
+def bench_bulk():
+    """Per-row cost of add/start/done/delete, one call per task vs one batch"""
+    print(f"{'rows':>8}  {'operation':<10} {'one-by-one':>12} {'bulk':>12} {'speed-up':>9}")
+    print("-" * 56)
+
+    for size in BULK_SIZES:
+        items = [(f"Task {i}", "", "Work", "Medium") for i in range(size)]
+
+        reset_tasks()
+        ids, add_single = timed(lambda: [tasks.add_task(*item) for item in items])
+        _, start_single = timed(lambda: [tasks.start_task(i) for i in ids])
+        _, done_single = timed(lambda: [tasks.mark_done(i) for i in ids])
+        _, delete_single = timed(lambda: [tasks.delete_task(i) for i in ids])
+
+        reset_tasks()
+        ids, add_bulk = timed(tasks.add_tasks, items)
+        _, start_bulk = timed(tasks.start_many, ids)
+        _, done_bulk = timed(tasks.mark_done_many, ids)
+        _, delete_bulk = timed(tasks.delete_many, ids)
+
+        for name, single, bulk in [
+            ("add", add_single, add_bulk),
+            ("start", start_single, start_bulk),
+            ("done", done_single, done_bulk),
+            ("delete", delete_single, delete_bulk),
+        ]:
+            print(f"{size:>8}  {name:<10} {single / size * 1e6:>9.1f} µs "
+                  f"{bulk / size * 1e6:>9.1f} µs {single / bulk:>8.1f}x")
+        print()
+
+# ============================================================================
+# QUERY CACHE
+# ============================================================================
+
+CACHE_TASKS = 10_000
+CACHE_ROUNDS = 200
+
+def refresh_reads():
+    """The reads behind one GUI refresh: first page, hidden count, sidebar stats"""
+    tasks.list_tasks_page(include_hidden=False, columns=tasks.CARD_COLUMNS)
+    tasks.get_hidden_count()
+    tasks.get_task_statistics()
+
+def bench_cache():
+    """Repeated refreshes with the cache off, on, and on with a write between each"""
+    reset_tasks()
+    ids = tasks.add_tasks([(f"Task {i}", "", "Work", "Medium") for i in range(CACHE_TASKS)])
+    tasks.mark_done_many(ids[::3])
+
+    def rounds(write_between=False):
+        for i in range(CACHE_ROUNDS):
+            if write_between:
+                tasks.start_task(ids[i])
+            refresh_reads()
+
+    with tasks.cache.disabled():
+        _, uncached = timed(rounds)
+    tasks.cache.invalidate()
+    before = tasks.cache.info()
+    _, cached = timed(rounds)
+    after = tasks.cache.info()
+    _, with_writes = timed(rounds, True)
+
+    hits = after['hits'] - before['hits']
+    misses = after['misses'] - before['misses']
+    print(f"{CACHE_TASKS} tasks, {CACHE_ROUNDS} refreshes")
+    print(f"  no cache:              {uncached / CACHE_ROUNDS * 1000:8.2f} ms per refresh")
+    print(f"  cache:                 {cached / CACHE_ROUNDS * 1000:8.2f} ms per refresh "
+          f"({hits} hits, {misses} misses)")
+    print(f"  cache, write between:  {with_writes / CACHE_ROUNDS * 1000:8.2f} ms per refresh")
+
+# ============================================================================
+# REFRESH
+# ============================================================================
+# gui.py can't be imported here (it starts the Tk mainloop), so this times
+# the data side of rendering one card per task: how each card gets its
+# "Completed in" duration.
+
+REFRESH_SIZES = [1_000, 10_000]
+
+def card_durations_per_card_lookup(cards):
+    """Old TaskCard: every Done card re-ran list_tasks() to find its own row"""
+    durations = {}
+    for card in cards:
+        if card.status == "Done":
+            for task in tasks.list_tasks():
+                if task.id == card.id:
+                    durations[card.id] = tasks.get_task_duration(task)
+                    break
+    return durations
+
+def card_durations_batched(cards):
+    """Current TaskCard: durations come from the rows already loaded"""
+    return {card.id: tasks.get_task_duration(card) for card in cards if card.status == "Done"}
+
+def bench_refresh():
+    """Card data for N visible tasks (half of them completed)"""
+    print(f"{'tasks':>8}  {'per-card lookup':>16} {'batched':>12} {'speed-up':>9}")
+    print("-" * 50)
+
+    for size in REFRESH_SIZES:
+        reset_tasks()
+        ids = tasks.add_tasks([(f"Task {i}", "", "Work", "Medium") for i in range(size)])
+        tasks.mark_done_many(ids[::2])
+        cards = tasks.list_all_tasks(columns=tasks.CARD_COLUMNS)
+
+        # The old code predates the query cache
+        with tasks.cache.disabled():
+            _, before = timed(card_durations_per_card_lookup, cards)
+        _, after = timed(card_durations_batched, cards)
+        print(f"{size:>8}  {before * 1000:>13.1f} ms {after * 1000:>9.2f} ms {before / after:>8.0f}x")
+
+# ============================================================================
+# ARCHIVE
+# ============================================================================
+
+ARCHIVE_HISTORY = 200_000   # Tasks completed over a year ago
+ARCHIVE_OPEN = 500          # Open backlog
+ARCHIVE_ROUNDS = 50
+
+def open_task_reads():
+    """Reads that only care about open tasks"""
+    tasks.list_tasks_page(include_hidden=False, columns=tasks.CARD_COLUMNS)
+    tasks.get_unfinished_tasks(columns=tasks.CARD_COLUMNS)
+    tasks.get_hidden_count()
+
+def bench_archive():
+    """A long history of completed tasks, before and after it is archived"""
+    reset_tasks()
+    history = tasks.add_tasks([(f"Old task {i}", "", "Work", "Medium") for i in range(ARCHIVE_HISTORY)])
+    tasks.mark_done_many(history)
+    conn = tasks.get_connection(tasks.DB_FILE)
+    conn.execute("UPDATE tasks SET completed_date = date('now', '-400 days')")
+    conn.commit()
+    tasks.add_tasks([(f"Open task {i}", "", "Work", "Medium") for i in range(ARCHIVE_OPEN)])
+
+    def rounds(read):
+        with tasks.cache.disabled():
+            for _ in range(ARCHIVE_ROUNDS):
+                read()
+
+    _, open_before = timed(rounds, open_task_reads)
+    _, history_before = timed(rounds, tasks.list_all_tasks_page)
+    stats_before = tasks.get_task_statistics()
+
+    batches = []
+    while True:
+        moved, seconds = timed(tasks.archive_completed_batch, 365)
+        batches.append(seconds)
+        if moved < tasks.ARCHIVE_BATCH:
+            break
+    _, open_after = timed(rounds, open_task_reads)
+    _, history_after = timed(rounds, tasks.list_all_tasks_page)
+    stats_after = tasks.get_task_statistics()
+
+    print(f"{ARCHIVE_HISTORY} archived + {ARCHIVE_OPEN} open tasks, {ARCHIVE_ROUNDS} rounds of reads")
+    print(f"{'':<20} {'before':>10} {'after':>10}")
+    for name, before, after in [("open-task reads", open_before, open_after),
+                                ("history page", history_before, history_after)]:
+        print(f"  {name:<18} {before / ARCHIVE_ROUNDS * 1000:>7.2f} ms {after / ARCHIVE_ROUNDS * 1000:>7.2f} ms")
+    print(f"  archive run:       {sum(batches):8.2f} s in {len(batches)} batches "
+          f"(longest {max(batches) * 1000:.1f} ms)")
+    print(f"  statistics unchanged: {stats_before == stats_after}")
+
+# ============================================================================
+# VACUUM
+# ============================================================================
+
+VACUUM_TASKS = 50_000
+VACUUM_KEEP = 0.1           # Share of tasks left after the mass delete
+
+def backup_copy_time():
+    """Seconds to copy tasks.db the way backup.py does"""
+    _, seconds = timed(shutil.copy2, tasks.DB_FILE, tasks.DB_FILE + ".copy")
+    os.remove(tasks.DB_FILE + ".copy")
+    return seconds
+
+def bench_vacuum():
+    """Delete most of a large task list, then run maintenance"""
+    reset_tasks()
+    ids = tasks.add_tasks([(f"Task {i}", "Notes " * 100, "Work", "Medium") for i in range(VACUUM_TASKS)])
+    tasks.delete_many(ids[int(len(ids) * VACUUM_KEEP):])
+    checkpoint(tasks.DB_FILE, "TRUNCATE")
+
+    before = maintenance.storage_report(tasks.DB_FILE)
+    copy_before = backup_copy_time()
+    freed, seconds = timed(maintenance.run_all, tasks.DB_FILE)
+    after = maintenance.storage_report(tasks.DB_FILE)
+    copy_after = backup_copy_time()
+
+    print(f"{VACUUM_TASKS} tasks, {100 - VACUUM_KEEP * 100:.0f}% deleted")
+    print(f"{'':<20} {'before':>12} {'after':>12}")
+    print(f"  {'file size':<18} {before['file_bytes'] / 1024:>9,.0f} KB {after['file_bytes'] / 1024:>9,.0f} KB")
+    print(f"  {'free pages':<18} {before['free_pages']:>12,} {after['free_pages']:>12,}")
+    print(f"  {'backup copy':<18} {copy_before * 1000:>9.1f} ms {copy_after * 1000:>9.1f} ms")
+    print(f"  maintenance released {freed:,} pages in {seconds * 1000:.0f} ms")
+
+# ============================================================================
+# BACKUP
+# ============================================================================
+
+BACKUP_TASKS = 100_000
+
+def backup_by_file_copy(target):
+    """Old create_backup(): a COUNT(*) "verification", then a raw file copy"""
+    conn = sqlite3.connect(tasks.DB_FILE)
+    conn.execute("SELECT COUNT(*) FROM tasks")
+    conn.close()
+    shutil.copy2(tasks.DB_FILE, target)
+
+def backup_under_writes(make_backup, target):
+    """Run make_backup(target) while a thread keeps adding tasks
+
+    Returns (seconds, writes during the backup, slowest write in seconds,
+    tasks committed before it started, tasks in the copy or an error).
+    """
+    stop = threading.Event()
+    writes = []
+
+    def writer():
+        while not stop.is_set():
+            _, seconds = timed(tasks.add_task, "Written during backup")
+            writes.append(seconds)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    time.sleep(0.2)  # Let the WAL fill up with commits
+    committed = tasks.get_connection(tasks.DB_FILE).execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    written_before = len(writes)
+    _, seconds = timed(make_backup, target)
+    during = writes[written_before:]
+    stop.set()
+    thread.join()
+
+    try:
+        copy = sqlite3.connect(target)
+        check = copy.execute("PRAGMA quick_check").fetchone()[0]
+        in_copy = copy.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] if check == "ok" else check
+        copy.close()
+    except sqlite3.DatabaseError as e:
+        in_copy = str(e)
+    return seconds, len(during), max(during, default=0), committed, in_copy
+
+def bench_backup():
+    """Both backup methods against a large database that is being written to"""
+    reset_tasks()
+    tasks.add_tasks([(f"Task {i}", "Notes " * 20, "Work", "Medium") for i in range(BACKUP_TASKS)])
+
+    print(f"{BACKUP_TASKS} tasks, one thread adding tasks throughout")
+    print(f"{'method':<12} {'time':>9} {'writes':>7} {'slowest':>9} {'committed':>10} {'in copy':>9}")
+    for name, make_backup in [("file copy", backup_by_file_copy),
+                              ("backup API", lambda target: backup.copy_database(tasks.DB_FILE, target))]:
+        target = os.path.join(os.getcwd(), name.replace(" ", "_") + ".db")
+        seconds, writes, slowest, committed, in_copy = backup_under_writes(make_backup, target)
+        print(f"{name:<12} {seconds * 1000:>6.0f} ms {writes:>7} {slowest * 1000:>6.1f} ms "
+              f"{committed:>10} {in_copy:>9}")
+
+# ============================================================================
+# COMMAND LINE INTERFACE
+# ============================================================================
+
+COMMANDS = {
+    "bulk": bench_bulk,
+    "cache": bench_cache,
+    "refresh": bench_refresh,
+    "archive": bench_archive,
+    "vacuum": bench_vacuum,
+    "backup": bench_backup,
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print("Usage: python benchmark.py [" + "|".join(COMMANDS) + "]")
+        sys.exit(1)
+
+    print(f"[Benchmark] Using temporary database in {os.getcwd()}")
+    COMMANDS[sys.argv[1]]()
@@ -2,16 +2,184 @@
 
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 
 # Database file name
 DB_NAME = "todo.db"
 
+# Connections kept open for worker threads (per database file)
+POOL_SIZE = 4
+
+# Storage mode - WAL lets readers and a writer work at the same time
+JOURNAL_MODE = "WAL"
+SYNCHRONOUS = "NORMAL"          # Safe with WAL, avoids an fsync per commit
+BUSY_TIMEOUT_MS = 5000          # Wait this long for a lock before giving up
+WAL_AUTOCHECKPOINT_PAGES = 1000 # SQLite's own checkpoint threshold
+CHECKPOINT_INTERVAL = 300       # Seconds between scheduled checkpoints
+AUTO_VACUUM = "INCREMENTAL"     # Free pages can be released later (see maintenance.py)
+
+# ----------------------------
+# Connection manager
+# ----------------------------
+# Every thread gets one long-lived connection per database file, so callers
+# never pay for sqlite3.connect() more than once. Short-lived worker threads
+# borrow from a small pool instead of creating connections of their own.
+
+_local = threading.local()
+_pools = {}
+_pools_lock = threading.Lock()
+
+def _open_connection(db_file):
+    """Open a new connection and apply the standard tuning pragmas."""
+    conn = sqlite3.connect(
+        db_file,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False
+    )
+    # Only takes effect on a brand-new file, and only before the WAL switch
+    # writes its header; existing files are converted by maintenance.py
+    conn.execute(f"PRAGMA auto_vacuum = {AUTO_VACUUM}")
+    conn.execute(f"PRAGMA journal_mode = {JOURNAL_MODE}")
+    conn.execute(f"PRAGMA synchronous = {SYNCHRONOUS}")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA wal_autocheckpoint = {WAL_AUTOCHECKPOINT_PAGES}")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -8000")  # ~8 MB page cache
+    return conn
+
+def get_connection(db_file=DB_NAME):
+    """Return this thread's shared connection to db_file.
+
+    The connection stays open for the life of the thread - callers must
+    commit their writes but must NOT close it.
+    """
+    conns = getattr(_local, "connections", None)
+    if conns is None:
+        conns = _local.connections = {}
+
+    conn = conns.get(db_file)
+    if conn is None:
+        conn = conns[db_file] = _open_connection(db_file)
+    return conn
+
+class ConnectionPool:
+    """Small pool of ready connections for worker threads"""
+
+    def __init__(self, db_file, size=POOL_SIZE):
+        self.db_file = db_file
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take an idle connection, or open a new one if none is free"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return _open_connection(self.db_file)
+
+    def release(self, conn):
+        """Return a connection; extras beyond the pool size are closed"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+def get_pool(db_file=DB_NAME):
+    """Return the process-wide pool for db_file"""
+    with _pools_lock:
+        pool = _pools.get(db_file)
+        if pool is None:
+            pool = _pools[db_file] = ConnectionPool(db_file)
+        return pool
+
+@contextmanager
+def pooled_connection(db_file=DB_NAME):
+    """Borrow a pooled connection for the duration of a with-block"""
+    pool = get_pool(db_file)
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+@contextmanager
+def write_transaction(conn):
+    """Run a with-block as one BEGIN IMMEDIATE ... COMMIT transaction
+
+    Taking the write lock up front means one commit (and at most one
+    fsync) for the whole block, and no other writer can interleave.
+    A transaction still open on the shared connection is rolled back first,
+    so its half-done work is never committed along with this block.
+    """
+    if conn.in_transaction:
+        print("[Database] Rolling back a transaction left open on this connection")
+        conn.rollback()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn.cursor()
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+def close_thread_connections():
+    """Close the calling thread's shared connections (e.g. before it exits)"""
+    conns = getattr(_local, "connections", None)
+    if conns:
+        for conn in conns.values():
+            conn.close()
+        conns.clear()
+
 # ----------------------------
-# Return a connection to the database
+# WAL checkpoints
 # ----------------------------
-def get_connection():
-    """Return a SQLite database connection."""
-    return sqlite3.connect(DB_NAME)
+
+_checkpoint_timers = {}
+
+def checkpoint(db_file=DB_NAME, mode="PASSIVE"):
+    """Copy WAL frames back into the database file.
+
+    PASSIVE never waits for readers or writers; TRUNCATE also resets the
+    -wal file to zero bytes. Returns (busy, wal_frames, checkpointed_frames).
+    """
+    with pooled_connection(db_file) as conn:
+        return conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+def schedule_checkpoints(db_file=DB_NAME, interval=CHECKPOINT_INTERVAL):
+    """Run a passive checkpoint every `interval` seconds on a daemon timer"""
+    def run():
+        try:
+            checkpoint(db_file)
+        except sqlite3.Error as e:
+            print(f"[Database] Checkpoint failed: {e}")
+        # Keep going unless stop_checkpoints() was called meanwhile
+        if _checkpoint_timers.get(db_file) is timer:
+            schedule_checkpoints(db_file, interval)
+
+    timer = threading.Timer(interval, run)
+    timer.daemon = True
+    _checkpoint_timers[db_file] = timer
+    timer.start()
+    return timer
+
+def stop_checkpoints(db_file=DB_NAME):
+    """Cancel the scheduled checkpoints for db_file"""
+    timer = _checkpoint_timers.pop(db_file, None)
+    if timer:
+        timer.cancel()
 
 # ----------------------------
 # Create tasks table if it doesn't exist
@@ -21,7 +189,7 @@ def create_table():
     # Ensure the database file exists in the current folder
     if not os.path.exists(DB_NAME):
         open(DB_NAME, 'w').close()
-        
+
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
@@ -33,7 +201,6 @@ def create_table():
         )
     """)
     conn.commit()
-    conn.close()
 
 # ----------------------------
 # Optional: Initialize the database when this file is run directly
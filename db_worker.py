@@ -0,0 +1,114 @@
+# db_worker.py - Runs database calls off the Tk thread
+# The GUI submits a call, keeps handling input, and gets the result back on
+# the Tk thread through root.after - Tk widgets must only be touched there.
+#
+#   worker = DBWorker(root)
+#   worker.submit(list_tasks, on_done=render, key="main-list")
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from database import close_thread_connections
+
+POLL_MS = 15  # How often finished calls are checked while any are in flight
+
+class DBWorker:
+    """One background thread for database calls, with results delivered to Tk
+
+    Calls run one at a time in submission order, so a refresh submitted
+    after a write always sees that write.
+    """
+
+    def __init__(self, root, on_busy=None):
+        self.root = root
+        self.on_busy = on_busy        # Called with True/False as work starts/ends
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tasky-gui-db")
+        self._finished = queue.Queue()
+        self._latest = {}             # key -> newest future for that key
+        self._in_flight = 0
+        self._polling = False
+
+    @property
+    def busy(self):
+        return self._in_flight > 0
+
+    def submit(self, func, *args, key=None, on_done=None, on_error=None, **kwargs):
+        """Run func(*args, **kwargs) on the worker thread. Call from the Tk thread.
+
+        on_done(result) or on_error(exception) runs later on the Tk thread.
+        A call with a key supersedes any earlier call with the same key: the
+        earlier one is cancelled if it hasn't started, and its result is
+        dropped if it has.
+        """
+        if key is not None:
+            self.cancel(key)
+
+        future = self._executor.submit(func, *args, **kwargs)
+        if key is not None:
+            self._latest[key] = future
+
+        self._in_flight += 1
+        if self._in_flight == 1 and self.on_busy:
+            self.on_busy(True)
+
+        # Runs on the worker thread - only hand the result over
+        future.add_done_callback(lambda f: self._finished.put((f, key, on_done, on_error)))
+
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+        return future
+
+    def cancel(self, key):
+        """Drop the pending call for key, if any"""
+        future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def _poll(self):
+        """Deliver finished calls on the Tk thread"""
+        try:
+            self._deliver()
+        finally:
+            # A failing callback must not stop later results from arriving
+            if self._in_flight > 0:
+                self.root.after(POLL_MS, self._poll)
+            else:
+                self._polling = False
+                if self.on_busy:
+                    self.on_busy(False)
+
+    def _deliver(self):
+        while True:
+            try:
+                future, key, on_done, on_error = self._finished.get_nowait()
+            except queue.Empty:
+                break
+
+            self._in_flight -= 1
+            if key is not None:
+                if self._latest.get(key) is not future:
+                    continue  # Superseded by a newer call
+                del self._latest[key]
+            if future.cancelled():
+                continue
+
+            callback = on_done
+            try:
+                error = future.exception()
+                if error is not None:
+                    callback = on_error
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"[DBWorker] {type(error).__name__}: {error}")
+                elif on_done:
+                    on_done(future.result())
+            except Exception as e:
+                name = getattr(callback, "__qualname__", repr(callback))
+                print(f"[DBWorker] {name} failed: {e}")
+
+    def shutdown(self):
+        """Finish queued calls, close the worker's connection and stop the thread"""
+        self._executor.submit(close_thread_connections)
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,93 @@
+# events.py - In-process change notifications from the data layer
+# tasks.py and planner_db.py publish a ChangeEvent after every committed
+# write; windows subscribe and patch only the rows that changed instead of
+# rebuilding everything.
+#
+#   unsubscribe = subscribe(on_task_change, entity="task")
+
+import queue
+import threading
+from typing import NamedTuple
+
+# Event kinds
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+HIDDEN = "hidden"
+SHOWN = "shown"
+
+class ChangeEvent(NamedTuple):
+    """One committed change to tasks or plans"""
+    entity: str         # 'task' or 'plan'
+    kind: str           # CREATED, UPDATED, DELETED, HIDDEN or SHOWN
+    ids: tuple = ()     # Rows affected - empty for table-wide changes (hide/show all)
+    count: int = 0      # Number of rows affected
+
+_subscribers = []
+_lock = threading.Lock()
+
+def subscribe(callback, entity=None, kinds=None, dispatch=None):
+    """Call callback(event) for matching events. Returns an unsubscribe function.
+
+    Args:
+        entity: Only events for this entity ('task' or 'plan'), None for all
+        kinds: Only these event kinds, None for all
+        dispatch: Optional dispatch(callback, event) that runs the callback
+                  somewhere else (e.g. TkDispatcher for the Tk thread);
+                  by default it runs on the publishing thread
+    """
+    entry = (callback, entity, frozenset(kinds) if kinds else None, dispatch)
+    with _lock:
+        _subscribers.append(entry)
+
+    def unsubscribe():
+        with _lock:
+            if entry in _subscribers:
+                _subscribers.remove(entry)
+    return unsubscribe
+
+def publish(entity, kind, ids=(), count=None):
+    """Notify subscribers of a committed change"""
+    ids = tuple(ids)
+    event = ChangeEvent(entity, kind, ids, len(ids) if count is None else count)
+    with _lock:
+        subscribers = list(_subscribers)
+
+    for callback, want_entity, want_kinds, dispatch in subscribers:
+        if want_entity is not None and want_entity != entity:
+            continue
+        if want_kinds is not None and kind not in want_kinds:
+            continue
+        try:
+            if dispatch:
+                dispatch(callback, event)
+            else:
+                callback(event)
+        except Exception as e:
+            # A broken subscriber must never undo or block a write
+            print(f"[Events] {callback.__qualname__} failed on {kind} {entity}: {e}")
+
+class TkDispatcher:
+    """Runs event callbacks on the Tk thread, whichever thread published them"""
+
+    POLL_MS = 50
+
+    def __init__(self, root):
+        self.root = root
+        self._pending = queue.Queue()
+        self.root.after(self.POLL_MS, self._poll)
+
+    def __call__(self, callback, event):
+        self._pending.put((callback, event))
+
+    def _poll(self):
+        while True:
+            try:
+                callback, event = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[Events] {callback.__qualname__} failed on {event.kind} {event.entity}: {e}")
+        self.root.after(self.POLL_MS, self._poll)
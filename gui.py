@@ -5,11 +5,17 @@
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
-from tasks import add_task, list_tasks, mark_done, delete_task, start_task, get_task_duration, format_duration, get_task_statistics, get_daily_performance, get_weekly_performance, get_monthly_performance, get_completion_streak, get_hidden_count
+from tasks import add_task, mark_done, delete_task, start_task, get_task_duration, format_duration, get_task_statistics, get_duration_percentiles, get_analytics_snapshot, get_hidden_count, search_tasks
 import tkinter.font as tkFont
 from datetime import datetime, date
 from app_state import AppState, set_control_functions
 from planner_window import PlannerWindow
+from database import schedule_checkpoints
+from tasks import DB_FILE, ARCHIVE_BATCH, archive_completed_batch
+from db_worker import DBWorker
+from events import subscribe, TkDispatcher, CREATED, DELETED, HIDDEN, SHOWN
+from maintenance import run_idle_step
+import time
 
 # ============================================================================
 # MAIN WINDOW SETUP - Professional clean layout
@@ -29,6 +35,12 @@ root.grid_columnconfigure(0, weight=1)
 BG_COLOR = "#f0f2f5"  # Softer, more professional background
 root.configure(bg=BG_COLOR, bd=0, highlightthickness=0)
 
+# All database calls run on this worker; results come back via root.after
+db_worker = DBWorker(root)
+
+# Change events from the data layer are handled on the Tk thread
+ui_events = TkDispatcher(root)
+
 # ============================================================================
 # PROFESSIONAL COLOR PALETTE
 # ============================================================================
@@ -77,19 +89,20 @@ CONTENT_SHIFT = SIDEBAR_WIDTH + 10
 # TASK MANAGEMENT FUNCTIONS
 # ============================================================================
 
+# The list itself is patched by on_task_change() when the write commits
+
 def mark_done_gui(task_id):
-    mark_done(task_id)
-    refresh_tasks()
+    db_worker.submit(mark_done, task_id)
 
 def delete_task_gui(task_id):
     if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this task?"):
-        delete_task(task_id)
-        refresh_tasks()
+        db_worker.submit(delete_task, task_id)
 
 def start_task_gui(task_id):
-    start_task(task_id)
-    refresh_tasks()
-    messagebox.showinfo("Task Started", "Timer started for this task!")
+    db_worker.submit(
+        start_task, task_id,
+        on_done=lambda _: messagebox.showinfo("Task Started", "Timer started for this task!")
+    )
 
 def add_task_gui():
     """Professional add task dialog"""
@@ -225,8 +238,7 @@ def add_task_gui():
             return
         
         description = desc_entry.get().strip()
-        add_task(title, description, category_var.get(), priority_var.get())
-        refresh_tasks()
+        db_worker.submit(add_task, title, description, category_var.get(), priority_var.get())
         dialog.destroy()
     
     def cancel():
@@ -264,40 +276,139 @@ def add_task_gui():
     dialog.bind('<Escape>', lambda e: cancel())
     root.wait_window(dialog)
 
+def search_tasks_gui(initial_query=""):
+    """Search dialog - results update as you type"""
+    dialog = tk.Toplevel(root)
+    dialog.title("Search")
+    dialog.geometry("520x440")
+    dialog.configure(bg=TASK_BG)
+    dialog.transient(root)
+    
+    # Center on parent
+    dialog.update_idletasks()
+    x = root.winfo_x() + (root.winfo_width() // 2) - (520 // 2)
+    y = root.winfo_y() + (root.winfo_height() // 2) - (440 // 2)
+    dialog.geometry(f"+{x}+{y}")
+    
+    # Header
+    header_frame = tk.Frame(dialog, bg=HEADER_BG, height=50)
+    header_frame.pack(fill="x")
+    header_frame.pack_propagate(False)
+    
+    tk.Label(
+        header_frame,
+        text="🔍 Search Tasks & Plans",
+        font=("Segoe UI", 14, "bold"),
+        bg=HEADER_BG,
+        fg=TEXT_WHITE
+    ).pack(pady=12)
+    
+    content = tk.Frame(dialog, bg=TASK_BG, padx=25, pady=15)
+    content.pack(fill="both", expand=True)
+    
+    query_entry = tk.Entry(content, font=desc_font, relief="solid", bd=1)
+    query_entry.pack(fill="x", pady=(0, 10), ipady=5)
+    query_entry.insert(0, initial_query)
+    
+    results_frame = tk.Frame(content, bg=TASK_BG)
+    results_frame.pack(fill="both", expand=True)
+    
+    def show_results():
+        query = query_entry.get().strip()
+        if not query:
+            for widget in results_frame.winfo_children():
+                widget.destroy()
+            return
+        db_worker.submit(search_tasks, query, limit=8, key="search", on_done=show_matches)
+    
+    def show_matches(results):
+        if not dialog.winfo_exists():
+            return
+        for widget in results_frame.winfo_children():
+            widget.destroy()
+        
+        if not results:
+            tk.Label(
+                results_frame,
+                text="No matches",
+                font=desc_font,
+                bg=TASK_BG,
+                fg=TEXT_LIGHT
+            ).pack(anchor="w")
+            return
+        
+        for result in results:
+            row = tk.Frame(results_frame, bg=TASK_BG)
+            row.pack(fill="x", pady=(0, 8))
+            
+            icon = "📋" if result.kind == "plan" else ("✓" if result.status == "Done" else "•")
+            tk.Label(
+                row,
+                text=f"{icon} {result.title}",
+                font=("Segoe UI", 11, "bold"),
+                bg=TASK_BG,
+                fg=TEXT_PRIMARY,
+                anchor="w"
+            ).pack(fill="x")
+            
+            if result.snippet and result.snippet != result.title:
+                tk.Label(
+                    row,
+                    text=result.snippet,
+                    font=("Segoe UI", 9),
+                    bg=TASK_BG,
+                    fg=TEXT_SECONDARY,
+                    anchor="w",
+                    justify="left",
+                    wraplength=450
+                ).pack(fill="x")
+    
+    # Wait for a short pause in typing before querying
+    pending = [None]
+    def schedule_search(event=None):
+        if pending[0]:
+            dialog.after_cancel(pending[0])
+        pending[0] = dialog.after(200, show_results)
+    
+    query_entry.bind('<KeyRelease>', schedule_search)
+    dialog.bind('<Escape>', lambda e: dialog.destroy())
+    query_entry.focus_set()
+    show_results()
+
 # ===== MANUAL REFRESH  =====
 def manual_refresh():
     """Permanently hide incomplete tasks from main view"""
     print("[Manual Refresh] Hiding incomplete tasks permanently...")
+    from tasks import hide_incomplete_tasks, get_hidden_count
     
-    # Hide tasks in database
-    from tasks import hide_incomplete_tasks
-    hidden_count = hide_incomplete_tasks()
+    def hide_in_db():
+        return hide_incomplete_tasks(), get_hidden_count()
     
-    # Clear main view
-    for widget in task_container.winfo_children():
-        widget.destroy()
-    AppState.active_buttons = None
-    
-    # Show empty state message
-    if hidden_count > 0:
-        show_empty_main_message(
-            "✨ Tasks hidden", 
-            f"{hidden_count} tasks hidden - use 'Show All' to restore"
-        )
-    else:
-        show_empty_main_message(
-            "✨ All caught up!", 
-            "No incomplete tasks to hide"
-        )
+    def hidden(counts):
+        hidden_now, hidden_total = counts
+        
+        # When tasks were hidden, the HIDDEN event reloads the (now empty) list
+        if hidden_now == 0:
+            clear_task_list()
+            show_empty_main_message(
+                "✨ All caught up!", 
+                "No incomplete tasks to hide",
+                hidden_total
+            )
+        
+        # Show visual feedback
+        show_refresh_feedback()
     
-    # Show visual feedback
-    show_refresh_feedback()
+    db_worker.submit(hide_in_db, on_done=hidden)
 
 def unhide_all_tasks():
     """Show all tasks again (reset hidden status)"""
-    from tasks import unhide_all_tasks, get_hidden_count
-    
-    hidden_count = get_hidden_count()
+    from tasks import get_hidden_count
+    db_worker.submit(get_hidden_count, on_done=confirm_unhide)
+
+def confirm_unhide(hidden_count):
+    """Ask before restoring hidden_count tasks, then restore them"""
+    from tasks import unhide_all_tasks
     
     if hidden_count == 0:
         messagebox.showinfo("No Hidden Tasks", "There are no hidden tasks to show.")
@@ -307,8 +418,7 @@ def unhide_all_tasks():
         "Show All Tasks",
         f"This will show {hidden_count} hidden tasks on the main page. Continue?"
     ):
-        unhide_all_tasks()
-        refresh_tasks()
+        db_worker.submit(unhide_all_tasks)
         
         # Show feedback
         feedback = tk.Toplevel(root)
@@ -330,14 +440,13 @@ def unhide_all_tasks():
         
         feedback.after(1500, feedback.destroy)
 
-def show_empty_main_message(title="✨ All tasks hidden", subtitle="Click 'Show All Tasks' to restore"):
+def show_empty_main_message(title="✨ All tasks hidden", subtitle="Click 'Show All Tasks' to restore", hidden_count=0):
     """Show a message when main page is empty
     Args:
         title: Main message to display
         subtitle: Secondary instruction message
+        hidden_count: Hidden tasks in the database (adds a 'Show All' button)
     """
-    from tasks import get_hidden_count
-    
     empty_frame = tk.Frame(task_container, bg=BG_COLOR)
     empty_frame.pack(fill="both", expand=True, pady=100)
     
@@ -376,7 +485,7 @@ def show_empty_main_message(title="✨ All tasks hidden", subtitle="Click 'Show
     ).pack()
     
     # Optional: Add "Show All Tasks" button if there are hidden tasks
-    if get_hidden_count() > 0:
+    if hidden_count > 0:
         show_btn = tk.Button(
             empty_frame,
             text="Show All Tasks",
@@ -495,6 +604,41 @@ tk.Label(
 right_buttons = tk.Frame(header, bg=HEADER_BG)
 right_buttons.pack(side="right", padx=20)
 
+# Shown while database work is in flight
+busy_label = tk.Label(
+    right_buttons,
+    text="⏳ Working…",
+    font=("Segoe UI", 10),
+    bg=HEADER_BG,
+    fg="#a0b3c9"
+)
+
+def show_busy(busy):
+    if busy:
+        busy_label.pack(side="left", padx=5, before=search_entry)
+    else:
+        busy_label.pack_forget()
+
+# Search box - Enter opens the search dialog
+search_entry = tk.Entry(
+    right_buttons,
+    font=("Segoe UI", 11),
+    width=18,
+    bg="#2c3e50",
+    fg=TEXT_WHITE,
+    insertbackground=TEXT_WHITE,
+    relief="flat"
+)
+search_entry.pack(side="left", padx=5, ipady=4)
+
+def open_search(event=None):
+    query = search_entry.get().strip()
+    search_entry.delete(0, tk.END)
+    search_tasks_gui(query)
+
+search_entry.bind('<Return>', open_search)
+db_worker.on_busy = show_busy
+
 # Refresh button
 refresh_btn = tk.Button(
     right_buttons,
@@ -596,6 +740,7 @@ def toggle_progress_window():
     
     if AppState.progress_window_active:
         # Close progress window
+        db_worker.cancel("analytics")
         if AppState.progress_frame:
             AppState.progress_frame.pack_forget()
         AppState.progress_window_active = False
@@ -608,8 +753,8 @@ def toggle_progress_window():
     else:
         # Open progress window
         hide_main_content()
-        create_progress_window()
         AppState.progress_window_active = True
+        create_progress_window()
 
 # Register control functions
 set_control_functions(hide_main_content, show_main_content, toggle_mini_window)
@@ -619,7 +764,7 @@ print("[GUI] Control functions registered")
 # INITIALIZE PLANNER
 # ============================================================================
 
-planner = PlannerWindow(root, main_container)
+planner = PlannerWindow(root, main_container, dispatch=ui_events)
 
 # ============================================================================
 # SIDEBAR CONSTRUCTION - Modern, clean design
@@ -949,9 +1094,11 @@ stats_content = tk.Frame(stats_container, bg=TASK_BG)
 def update_stats():
     if not AppState.stats_expanded:
         return
-        
-    stats = get_task_statistics()
-    
+    db_worker.submit(get_task_statistics, key="stats", on_done=show_stats)
+    # Cached until a task is completed or deleted - usually free
+    db_worker.submit(get_duration_percentiles, (50, 90), key="percentiles", on_done=show_percentiles)
+
+def show_stats(stats):
     total_label.config(text=f"Total: {stats['total']}")
     completed_label.config(text=f"Done: {stats['completed']}")
     pending_label.config(text=f"Pending: {stats['pending']}")
@@ -964,6 +1111,29 @@ def update_stats():
         )
     else:
         avg_time_label.config(text="Avg: No data", fg=TEXT_LIGHT)
+    
+    # Open tasks per priority, busiest category
+    open_by_priority = [
+        f"{name} {stats['by_priority'][name]['pending']}"
+        for name in ("High", "Medium", "Low")
+        if stats['by_priority'].get(name, {}).get('pending')
+    ]
+    priority_label.config(text="Open: " + (" · ".join(open_by_priority) or "none"))
+    
+    if stats['by_category']:
+        top_name, top = max(stats['by_category'].items(), key=lambda item: item[1]['completed'])
+        category_label.config(text=f"Top: {top_name} ({top['completed']} done)", fg=TEXT_PRIMARY)
+    else:
+        category_label.config(text="Top: No data", fg=TEXT_LIGHT)
+
+def show_percentiles(percentiles):
+    if percentiles[50] is not None:
+        typical_label.config(
+            text=f"Median: {format_duration(percentiles[50])} · P90: {format_duration(percentiles[90])}",
+            fg=TEXT_PRIMARY
+        )
+    else:
+        typical_label.config(text="Median: No data", fg=TEXT_LIGHT)
 
 # Stats display
 total_label = tk.Label(stats_content, font=small_font, bg=TASK_BG, fg=TEXT_PRIMARY, anchor="w")
@@ -981,6 +1151,15 @@ rate_label.pack(fill="x", pady=3)
 avg_time_label = tk.Label(stats_content, font=small_font, bg=TASK_BG, fg=TEXT_LIGHT, anchor="w")
 avg_time_label.pack(fill="x", pady=3)
 
+typical_label = tk.Label(stats_content, font=small_font, bg=TASK_BG, fg=TEXT_LIGHT, anchor="w")
+typical_label.pack(fill="x", pady=3)
+
+priority_label = tk.Label(stats_content, font=small_font, bg=TASK_BG, fg=TEXT_PRIMARY, anchor="w")
+priority_label.pack(fill="x", pady=3)
+
+category_label = tk.Label(stats_content, font=small_font, bg=TASK_BG, fg=TEXT_PRIMARY, anchor="w")
+category_label.pack(fill="x", pady=3)
+
 separator3 = tk.Frame(mini_content, height=1, bg="#ecf0f1")
 separator3.pack(fill="x", pady=10)
 
@@ -1067,7 +1246,7 @@ task_container.bind("<Configure>", update_scroll_region)
 # ============================================================================
 
 class TaskCard:
-    def __init__(self, parent, idx, task_id, title, status, description, category="General", priority="Medium"):
+    def __init__(self, parent, idx, task_id, title, status, description, category="General", priority="Medium", duration=None):
         self.parent = parent
         self.task_id = task_id
         self.buttons_visible = False
@@ -1174,22 +1353,17 @@ class TaskCard:
             )
             self.desc.pack(anchor="w", pady=(5, 0))
 
-        # Duration for completed tasks
-        if status == "Done":
-            for task in list_tasks():
-                if task[0] == task_id:
-                    duration = get_task_duration(task)
-                    if duration:
-                        self.duration = tk.Label(
-                            left,
-                            text=f"Completed in {format_duration(duration)}",
-                            font=("Segoe UI", 10),
-                            bg=TASK_BG,
-                            fg=ACCENT_GREEN,
-                            anchor="w"
-                        )
-                        self.duration.pack(anchor="w", pady=(5, 0))
-                    break
+        # Duration for completed tasks (minutes, worked out by the caller)
+        if status == "Done" and duration:
+            self.duration = tk.Label(
+                left,
+                text=f"Completed in {format_duration(duration)}",
+                font=("Segoe UI", 10),
+                bg=TASK_BG,
+                fg=ACCENT_GREEN,
+                anchor="w"
+            )
+            self.duration.pack(anchor="w", pady=(5, 0))
 
         # Buttons
         self.btn_frame = tk.Frame(content, bg=TASK_BG)
@@ -1278,16 +1452,22 @@ class TaskCard:
 # TASK REFRESH
 # ============================================================================
 
+def load_main_view():
+    """Worker side of refresh_tasks: first page of visible tasks + hidden count"""
+    from tasks import list_tasks_page, get_hidden_count, CARD_COLUMNS
+    visible_tasks, next_cursor = list_tasks_page(include_hidden=False, columns=CARD_COLUMNS)
+    return visible_tasks, next_cursor, get_hidden_count()
+
 def refresh_tasks():
-    """Refresh tasks display - only shows visible (hidden=0) tasks"""
-    for widget in task_container.winfo_children():
-        widget.destroy()
-    AppState.active_buttons = None
+    """Refresh tasks display - only shows visible (not hidden) tasks"""
+    # A newer refresh replaces any list load still pending
+    db_worker.cancel("more-tasks")
+    db_worker.submit(load_main_view, key="main-list", on_done=render_main_view)
 
-    # Use list_tasks() which now defaults to hidden=0
-    from tasks import list_tasks, get_hidden_count
-    visible_tasks = list_tasks(include_hidden=False)
-    hidden_count = get_hidden_count()
+def render_main_view(view):
+    """Rebuild the task list from load_main_view()'s result"""
+    visible_tasks, next_cursor, hidden_count = view
+    clear_task_list()
     
     # Debug output
     if hidden_count > 0:
@@ -1298,7 +1478,8 @@ def refresh_tasks():
         if hidden_count > 0:
             show_empty_main_message(
                 "✨ Tasks hidden", 
-                f"{hidden_count} tasks hidden - use 'Show All' to restore"
+                f"{hidden_count} tasks hidden - use 'Show All' to restore",
+                hidden_count
             )
         else:
             show_empty_main_message(
@@ -1308,24 +1489,9 @@ def refresh_tasks():
         return
     
     # Display visible tasks
-    for idx, task in enumerate(visible_tasks):
-        task_id = task[0]
-        title = task[1]
-        description = task[2] if task[2] else ""
-        status = task[3]
-        category = task[4] if task[4] else "General"
-        priority = task[5] if task[5] else "Medium"
-        
-        TaskCard(
-            task_container, 
-            idx, 
-            task_id, 
-            title, 
-            status, 
-            description,
-            category,
-            priority
-        )
+    render_task_cards(visible_tasks, 0)
+    if next_cursor is not None:
+        show_load_more_button(next_cursor, len(visible_tasks))
     
     update_scroll_region()
     reset_scroll_position()
@@ -1336,11 +1502,163 @@ def refresh_tasks():
     if AppState.mini_window_active and AppState.stats_expanded:
         update_stats()
 
+# TaskCards on screen by task id, in display order (newest first)
+task_cards = {}
+
+def clear_task_list():
+    """Remove every card and message from the main list"""
+    for widget in task_container.winfo_children():
+        widget.destroy()
+    task_cards.clear()
+    AppState.active_buttons = None
+
+def make_task_card(task, idx):
+    """Create (and pack at the end) the card for one task"""
+    return TaskCard(
+        task_container, 
+        idx, 
+        task.id, 
+        task.title, 
+        task.status, 
+        task.description or "",
+        task.category or "General",
+        task.priority or "Medium",
+        get_task_duration(task)
+    )
+
+def render_task_cards(tasks, start_idx):
+    """Append a TaskCard for each task, numbering from start_idx"""
+    for idx, task in enumerate(tasks, start=start_idx):
+        task_cards[task.id] = make_task_card(task, idx)
+
+def show_load_more_button(cursor, shown):
+    """Add a 'Load more' button below the cards for the next page"""
+    more_frame = tk.Frame(task_container, bg=BG_COLOR)
+    more_frame.pack(fill="x", pady=(5, 15))
+    
+    tk.Button(
+        more_frame,
+        text="Load more tasks",
+        font=button_font,
+        bg="#ecf0f1",
+        fg=TEXT_SECONDARY,
+        bd=0,
+        padx=20,
+        pady=8,
+        activebackground="#d5dbdb",
+        cursor="hand2",
+        command=lambda: load_more_tasks(cursor, shown, more_frame)
+    ).pack()
+
+def load_more_tasks(cursor, shown, more_frame):
+    """Fetch the page after cursor and append it to the list"""
+    from tasks import list_tasks_page, CARD_COLUMNS
+    more_frame.destroy()
+    db_worker.submit(
+        list_tasks_page, before_id=cursor, include_hidden=False, columns=CARD_COLUMNS,
+        key="more-tasks", on_done=lambda page: show_more_tasks(page, shown)
+    )
+
+def show_more_tasks(page, shown):
+    """Append a page fetched by load_more_tasks()"""
+    tasks, next_cursor = page
+    render_task_cards(tasks, shown)
+    if next_cursor is not None:
+        show_load_more_button(next_cursor, shown + len(tasks))
+    
+    update_scroll_region()
+    if AppState.rebind_scrolling_func:
+        AppState.rebind_scrolling_func()
+
+# ============================================================================
+# CHANGE EVENTS
+# ============================================================================
+
+def remove_task_card(task_id):
+    card = task_cards.pop(task_id, None)
+    if card is not None:
+        if AppState.active_buttons is card:
+            AppState.active_buttons = None
+        card.card.destroy()
+
+def renumber_task_cards():
+    for idx, card in enumerate(task_cards.values()):
+        card.num.config(text=f"{idx + 1}.")
+
+def patch_task_cards(event, tasks):
+    """Apply get_tasks() results for event.ids to the cards on screen"""
+    global task_cards
+    still_listed = {task.id for task in tasks}
+    for task_id in event.ids:
+        if task_id not in still_listed:
+            remove_task_card(task_id)  # Completed, hidden or deleted
+    
+    if not task_cards:
+        refresh_tasks()  # Empty-state message or the next page
+        return
+    
+    first_card = next(iter(task_cards.values()))
+    new_cards = {}
+    for task in tasks:
+        old_card = task_cards.get(task.id)
+        if old_card is not None:
+            # Rebuild in place
+            card = make_task_card(task, 0)
+            card.card.pack_configure(before=old_card.card)
+            old_card.card.destroy()
+            task_cards[task.id] = card
+        elif event.kind == CREATED:
+            # Newest tasks go on top
+            card = make_task_card(task, 0)
+            card.card.pack_configure(before=first_card.card)
+            new_cards[task.id] = card
+    
+    task_cards = {**new_cards, **task_cards}
+    renumber_task_cards()
+    update_scroll_region()
+    if AppState.rebind_scrolling_func:
+        AppState.rebind_scrolling_func()
+
+def on_task_change(event):
+    """Patch only what a task change touched (runs on the Tk thread)"""
+    from tasks import get_tasks, CARD_COLUMNS
+    
+    if event.kind == SHOWN or (event.kind == HIDDEN and not event.ids):
+        refresh_tasks()
+    elif event.kind == DELETED:
+        for task_id in event.ids:
+            remove_task_card(task_id)
+        if task_cards:
+            renumber_task_cards()
+            update_scroll_region()
+        else:
+            refresh_tasks()
+    else:
+        db_worker.submit(
+            get_tasks, event.ids, columns=CARD_COLUMNS,
+            on_done=lambda tasks: patch_task_cards(event, tasks)
+        )
+    
+    update_stats()
+    if AppState.progress_window_active and AppState.check_analytics_refresh():
+        create_progress_window()
+
+subscribe(on_task_change, entity="task", dispatch=ui_events)
+
 # ============================================================================
 # PROGRESS ANALYTICS WINDOW - Clean version (Unfinished tab removed)
 # ============================================================================
 
 def create_progress_window():
+    """Load the analytics snapshot in the background, then build the window"""
+    AppState.analytics_stale = False
+    db_worker.submit(get_analytics_snapshot, key="analytics", on_done=build_progress_window)
+
+def build_progress_window(snapshot):
+    # Closed again while the snapshot was loading
+    if not AppState.progress_window_active:
+        return
+    
     if AppState.progress_frame:
         try:
             if AppState.progress_frame.winfo_exists():
@@ -1469,8 +1787,10 @@ def create_progress_window():
     daily = tk.Frame(tab_frame, bg=BG_LIGHT)
     tab_contents["Daily"] = daily
     
-    daily_data = get_daily_performance()
-    streak = get_completion_streak()
+    # One consistent read for all three tabs
+    daily_data = snapshot.daily
+    streak_info = snapshot.streak
+    streak = streak_info['current']
     
     # Stats cards row
     card_row = tk.Frame(daily, bg=BG_LIGHT)
@@ -1504,7 +1824,7 @@ def create_progress_window():
     tk.Label(streak_card, text="🔥 Streak", font=("Segoe UI", 12), bg=TASK_BG, fg=TEXT_SECONDARY).pack(pady=(15, 5))
     streak_icon = "🔥" if streak > 0 else "📅"
     tk.Label(streak_card, text=f"{streak_icon} {streak}", font=("Segoe UI", 24, "bold"), bg=TASK_BG, fg=ACCENT_ORANGE).pack()
-    tk.Label(streak_card, text="days", font=("Segoe UI", 11), bg=TASK_BG, fg=TEXT_LIGHT).pack(pady=(5, 15))
+    tk.Label(streak_card, text=f"days · best {streak_info['longest']}", font=("Segoe UI", 11), bg=TASK_BG, fg=TEXT_LIGHT).pack(pady=(5, 15))
     
     # Progress bar
     if daily_data['total_created'] > 0:
@@ -1534,7 +1854,7 @@ def create_progress_window():
     weekly = tk.Frame(tab_frame, bg=BG_LIGHT)
     tab_contents["Weekly"] = weekly
     
-    weekly_data = get_weekly_performance()
+    weekly_data = snapshot.weekly
     
     w_frame = tk.Frame(weekly, bg=TASK_BG, bd=0, highlightbackground="#e0e0e0", highlightthickness=1)
     w_frame.pack(fill="x", pady=10)
@@ -1606,7 +1926,7 @@ def create_progress_window():
     monthly = tk.Frame(tab_frame, bg=BG_LIGHT)
     tab_contents["Monthly"] = monthly
     
-    monthly_data = get_monthly_performance()
+    monthly_data = snapshot.monthly
     
     m_frame = tk.Frame(monthly, bg=TASK_BG, bd=0, highlightbackground="#e0e0e0", highlightthickness=1)
     m_frame.pack(fill="x", pady=10)
@@ -1687,15 +2007,73 @@ def create_progress_window():
 root.bind("<Control-n>", lambda e: add_task_gui())
 root.bind("<Control-h>", lambda e: toggle_mini_window())
 
+# ============================================================================
+# BACKGROUND ARCHIVING
+# ============================================================================
+# Old completed tasks move to the archive one batch per worker call, so
+# clicks and refreshes never queue behind more than one short transaction
+
+ARCHIVE_PAUSE_MS = 200                  # Between batches while a backlog remains
+ARCHIVE_INTERVAL_MS = 60 * 60 * 1000    # Between runs once everything is archived
+
+def archive_in_background():
+    db_worker.submit(
+        archive_completed_batch, key="archive",
+        on_done=archive_batch_done, on_error=archive_batch_failed
+    )
+
+def archive_batch_done(moved):
+    delay = ARCHIVE_PAUSE_MS if moved >= ARCHIVE_BATCH else ARCHIVE_INTERVAL_MS
+    root.after(delay, archive_in_background)
+
+def archive_batch_failed(error):
+    print(f"[Archive] {type(error).__name__}: {error}")
+    root.after(ARCHIVE_INTERVAL_MS, archive_in_background)
+
+# ============================================================================
+# IDLE MAINTENANCE
+# ============================================================================
+# Once nobody has touched the app for a while, free pages are released and
+# planner statistics refreshed, one short step per check. When a step finds
+# nothing to do, checks pause until the next keypress or click.
+
+IDLE_AFTER_SECONDS = 60
+MAINTENANCE_CHECK_MS = 5_000
+
+maintenance_state = {'last_input': time.monotonic(), 'caught_up': False}
+
+def note_user_input(event=None):
+    maintenance_state['last_input'] = time.monotonic()
+    maintenance_state['caught_up'] = False
+
+root.bind_all("<Key>", note_user_input, add="+")
+root.bind_all("<Button>", note_user_input, add="+")
+
+def check_idle_maintenance():
+    idle = time.monotonic() - maintenance_state['last_input'] >= IDLE_AFTER_SECONDS
+    if idle and not maintenance_state['caught_up'] and not db_worker.busy:
+        db_worker.submit(run_idle_step, DB_FILE, key="maintenance", on_done=maintenance_step_done)
+    root.after(MAINTENANCE_CHECK_MS, check_idle_maintenance)
+
+def maintenance_step_done(action):
+    if action is None:
+        maintenance_state['caught_up'] = True
+    else:
+        print(f"[Maintenance] {action}")
+
 # ============================================================================
 # INITIAL LOAD
 # ============================================================================
 
 refresh_tasks()
 setup_scrolling()
+schedule_checkpoints(DB_FILE)
+archive_in_background()  # Queued behind the first list load
+root.after(MAINTENANCE_CHECK_MS, check_idle_maintenance)
 
 # ============================================================================
 # START THE APP
 # ============================================================================
 
-root.mainloop()
\ No newline at end of file
+root.mainloop()
+db_worker.shutdown()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import sys
 from database import create_table
-from tasks import add_task, list_tasks
+from tasks import add_task, iter_tasks, rebuild_daily_stats, search_tasks, archive_completed_tasks, get_archive_age
 from backup import create_backup  # ← NEW: Import backup function
 
 def main():
@@ -15,6 +15,9 @@ def main():
         print("Usage:")
         print("  python main.py add \"Task title\" [Description]")
         print("  python main.py list")
+        print("  python main.py search \"words\"")
+        print("  python main.py rebuild-stats")
+        print("  python main.py archive [days]")
         return
 
     command = sys.argv[1]
@@ -29,13 +32,36 @@ def main():
         print(f"Task '{title}' added successfully.")
 
     elif command == "list":
-        tasks = list_tasks()
-        if not tasks:
+        # Stream rows so long histories start printing immediately
+        found = False
+        for task in iter_tasks(columns=("title", "description", "status")):
+            if not found:
+                print("Here are your tasks:")
+                found = True
+            print(f"ID: {task.id} | Title: {task.title} | Description: {task.description} | Status: {task.status}")
+        if not found:
             print("No tasks found.")
-        else:
-            print("Here are your tasks:")
-            for task in tasks:
-                print(f"ID: {task[0]} | Title: {task[1]} | Description: {task[2]} | Status: {task[3]}")
+
+    elif command == "search":
+        if len(sys.argv) < 3:
+            print("Please provide something to search for.")
+            return
+        results = search_tasks(" ".join(sys.argv[2:]))
+        if not results:
+            print("No matches found.")
+        for result in results:
+            print(f"{result.kind.title()} {result.id} | {result.title} | {result.status} | {result.snippet}")
+
+    elif command == "rebuild-stats":
+        rebuild_daily_stats()
+
+    elif command == "archive":
+        days = int(sys.argv[2]) if len(sys.argv) > 2 else get_archive_age()
+        if not days:
+            print("Archiving is turned off (archive_after_days is 0).")
+            return
+        moved = archive_completed_tasks(days)
+        print(f"Archived {moved} tasks completed more than {days} days ago.")
 
     else:
         print(f"Unknown command '{command}'")
@@ -0,0 +1,156 @@
+# maintenance.py - Storage upkeep for tasks.db
+# Deleted tasks and plans leave free pages behind, and SQLite never gives
+# them back to the file system on its own. With auto_vacuum = INCREMENTAL
+# they can be released a few hundred pages at a time, so the GUI does it in
+# small steps while the user is idle, along with refreshing the statistics
+# the query planner uses (PRAGMA optimize / ANALYZE). Converting an older
+# file to INCREMENTAL takes a full VACUUM and is only done from the CLI.
+#
+#   python maintenance.py           - storage report
+#   python maintenance.py run       - convert, vacuum and optimize now
+
+import os
+import sys
+import time
+
+from database import get_connection, checkpoint
+
+DB_FILE = "tasks.db"
+
+VACUUM_STEP_PAGES = 256         # Pages released per idle step (1 MB at 4 KB pages)
+ANALYSIS_LIMIT = 1000           # Rows ANALYZE samples per index
+OPTIMIZE_INTERVAL = 60 * 60     # Seconds between PRAGMA optimize runs
+
+# auto_vacuum values reported by PRAGMA auto_vacuum
+AUTO_VACUUM_MODES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+INCREMENTAL = 2
+
+_last_optimize = {}  # db_file -> time.monotonic() of the last optimize
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def storage_report(db_file=DB_FILE):
+    """Page counts and file sizes for db_file
+
+    Returns:
+        dict: page_size, page_count, free_pages, fragmentation (% of pages
+              free), file_bytes, reclaimable_bytes, wal_bytes, auto_vacuum
+    """
+    conn = get_connection(db_file)
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    wal_file = db_file + "-wal"
+
+    return {
+        'page_size': page_size,
+        'page_count': page_count,
+        'free_pages': free_pages,
+        'fragmentation': free_pages / page_count * 100 if page_count else 0,
+        'file_bytes': os.path.getsize(db_file) if os.path.exists(db_file) else 0,
+        'reclaimable_bytes': free_pages * page_size,
+        'wal_bytes': os.path.getsize(wal_file) if os.path.exists(wal_file) else 0,
+        'auto_vacuum': AUTO_VACUUM_MODES.get(mode, str(mode)),
+    }
+
+def format_report(report):
+    """One line per figure, for the CLI"""
+    return "\n".join([
+        f"  File size:      {report['file_bytes'] / 1024:,.0f} KB "
+        f"(+{report['wal_bytes'] / 1024:,.0f} KB WAL)",
+        f"  Pages:          {report['page_count']:,} x {report['page_size']} bytes",
+        f"  Free pages:     {report['free_pages']:,} "
+        f"({report['fragmentation']:.1f}%, {report['reclaimable_bytes'] / 1024:,.0f} KB reclaimable)",
+        f"  auto_vacuum:    {report['auto_vacuum']}",
+    ])
+
+# ============================================================================
+# MAINTENANCE STEPS
+# ============================================================================
+
+def enable_incremental_vacuum(db_file=DB_FILE):
+    """Switch db_file to auto_vacuum = INCREMENTAL (one full VACUUM)
+
+    New databases get the mode from database.py before any table exists;
+    older ones need this rewrite once. Returns True if it ran.
+    """
+    conn = get_connection(db_file)
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == INCREMENTAL:
+        return False
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    print(f"[Maintenance] {db_file} now uses incremental vacuum")
+    return True
+
+def incremental_vacuum(db_file=DB_FILE, pages=VACUUM_STEP_PAGES):
+    """Return up to `pages` free pages to the file system. Returns pages freed."""
+    conn = get_connection(db_file)
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    # Each step of the pragma frees one page; execute() would only step it
+    # once, executescript() runs it to completion
+    conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+    return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+def optimize(db_file=DB_FILE):
+    """Refresh query planner statistics where they are missing or stale
+
+    analysis_limit keeps any ANALYZE this triggers to a bounded sample.
+    """
+    conn = get_connection(db_file)
+    conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+    ).fetchone()
+    if has_stats:
+        conn.execute("PRAGMA optimize")
+    else:
+        conn.execute("ANALYZE")
+    conn.commit()
+    _last_optimize[db_file] = time.monotonic()
+
+def run_idle_step(db_file=DB_FILE):
+    """Do one bounded piece of maintenance, if any is due
+
+    Never runs a full VACUUM - files without incremental vacuum only get
+    their statistics refreshed until `python maintenance.py run`.
+
+    Returns:
+        str: What was done, or None when there is nothing to do
+    """
+    conn = get_connection(db_file)
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode == INCREMENTAL and conn.execute("PRAGMA freelist_count").fetchone()[0]:
+        freed = incremental_vacuum(db_file)
+        return f"released {freed} free pages"
+
+    last = _last_optimize.get(db_file)
+    if last is None or time.monotonic() - last >= OPTIMIZE_INTERVAL:
+        optimize(db_file)
+        return "optimized"
+    return None
+
+def run_all(db_file=DB_FILE):
+    """Convert, vacuum every free page and optimize in one go (CLI)"""
+    enable_incremental_vacuum(db_file)
+    freed = incremental_vacuum(db_file, pages=0)  # 0 = all free pages
+    optimize(db_file)
+    # The file only shrinks once the WAL is copied back into it
+    checkpoint(db_file, "TRUNCATE")
+    return freed
+
+# ============================================================================
+# COMMAND LINE INTERFACE
+# ============================================================================
+
+if __name__ == "__main__":
+    print(f"[Maintenance] {DB_FILE}")
+    print(format_report(storage_report()))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "run":
+        started = time.perf_counter()
+        freed = run_all()
+        print(f"[Maintenance] Released {freed} pages in {time.perf_counter() - started:.2f}s")
+        print(format_report(storage_report()))
@@ -0,0 +1,610 @@
+# migrations.py - Versioned schema migrations for tasks.db
+# The schema version lives in PRAGMA user_version. Each migration runs once,
+# in order, inside its own transaction; a current database costs one read.
+
+import sqlite3
+from contextlib import contextmanager
+
+from timestamps import system_timezone_name
+
+# Ordered registry of (version, description, function)
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register a schema migration. Versions must be unique and increasing."""
+    def register(func):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration {version} registered out of order")
+        MIGRATIONS.append((version, description, func))
+        return func
+    return register
+
+def latest_version():
+    """Schema version this code expects"""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+def get_version(conn):
+    """Schema version stamped in the database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn):
+    """Bring the database up to latest_version(). Returns the final version."""
+    current = get_version(conn)
+    if current >= latest_version():
+        return current
+
+    for version, description, func in MIGRATIONS:
+        if version <= current:
+            continue
+        # Take the write lock first so two processes can't both apply a step
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_version(conn) >= version:
+                conn.rollback()
+                continue
+            func(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        print(f"[Database] Migrated schema to v{version}: {description}")
+
+    return get_version(conn)
+
+# ============================================================================
+# MIGRATIONS
+# ============================================================================
+
+@migration(1, "tasks table")
+def create_tasks_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT DEFAULT 'Pending',
+            category TEXT DEFAULT 'General',
+            priority TEXT DEFAULT 'Medium',
+            created_at TEXT,
+            started_at TEXT,
+            completed_at TEXT,
+            hidden INTEGER DEFAULT 0
+        )
+    ''')
+
+    # Databases created before task hiding existed lack the hidden column
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(tasks)")]
+    if 'hidden' not in columns:
+        conn.execute("ALTER TABLE tasks ADD COLUMN hidden INTEGER DEFAULT 0")
+
+@migration(2, "plans table")
+def create_plans_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS plans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            heading TEXT NOT NULL,
+            description TEXT,
+            focus_area TEXT DEFAULT 'General',
+            priority TEXT DEFAULT 'Medium',
+            time_frame TEXT NOT NULL,  -- 'Week' or 'Month'
+            created_at TEXT,
+            updated_at TEXT,
+            status TEXT DEFAULT 'Active'
+        )
+    ''')
+
+@migration(3, "indexes for status/hidden/date filters")
+def create_task_indexes(conn):
+    # Main view and hidden count: only incomplete rows, covering for counts
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_open_hidden
+        ON tasks(hidden, id, status) WHERE status != 'Done'
+    ''')
+    # Unfinished list (hidden or not), newest first
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_open
+        ON tasks(id, status) WHERE status != 'Done'
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+    # Daily/weekly/monthly analytics filter on the calendar day
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_day
+        ON tasks(date(created_at))
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed_day
+        ON tasks(date(completed_at))
+    ''')
+
+@migration(4, "local date/hour columns for task timestamps")
+def add_local_date_columns(conn):
+    # date(created_at) in a WHERE clause can't use a plain column index, so
+    # the local day and hour are stored alongside each timestamp
+    for prefix in ("created", "started", "completed"):
+        conn.execute(f"ALTER TABLE tasks ADD COLUMN {prefix}_date TEXT")
+        conn.execute(f"ALTER TABLE tasks ADD COLUMN {prefix}_hour INTEGER")
+        conn.execute(f'''
+            UPDATE tasks
+            SET {prefix}_date = date({prefix}_at),
+                {prefix}_hour = CAST(strftime('%H', {prefix}_at) AS INTEGER)
+            WHERE {prefix}_at IS NOT NULL
+        ''')
+
+    conn.execute("DROP INDEX IF EXISTS idx_tasks_created_day")
+    conn.execute("DROP INDEX IF EXISTS idx_tasks_completed_day")
+    conn.execute("CREATE INDEX idx_tasks_created_date ON tasks(created_date)")
+    conn.execute("CREATE INDEX idx_tasks_completed_date ON tasks(completed_date)")
+
+# Minutes from creation to completion, as the analytics have always counted it.
+# v5 worked them out from the timestamps; from v8 they are stored on the row.
+_JULIAN_MINUTES = "COALESCE((julianday({t}.completed_at) - julianday({t}.created_at)) * 24 * 60, 0)"
+_STORED_MINUTES = "COALESCE({t}.duration_seconds / 60.0, 0)"
+
+def _has_table(conn, name):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+def fill_daily_stats(conn):
+    """Recompute the daily_stats rollup from every task, archived ones included"""
+    source = "all_tasks" if _has_table(conn, "tasks_archive") else "tasks"
+    _fill_daily_stats(conn, _STORED_MINUTES, source)
+
+def _fill_daily_stats(conn, minutes, source="tasks"):
+    conn.execute("DELETE FROM daily_stats")
+    conn.execute(f'''
+        INSERT INTO daily_stats (day, category, created, completed, total_minutes)
+        SELECT day, category, SUM(created), SUM(completed), SUM(minutes)
+        FROM (
+            SELECT created_date AS day, COALESCE(category, 'General') AS category,
+                   1 AS created, 0 AS completed, 0 AS minutes
+            FROM {source} WHERE created_date IS NOT NULL
+            UNION ALL
+            SELECT completed_date, COALESCE(category, 'General'),
+                   0, 1, {minutes.format(t=source)}
+            FROM {source} WHERE completed_date IS NOT NULL
+        )
+        GROUP BY day, category
+    ''')
+
+@migration(5, "daily_stats rollup kept current by triggers")
+def create_daily_stats(conn):
+    conn.execute('''
+        CREATE TABLE daily_stats (
+            day TEXT NOT NULL,              -- local date, YYYY-MM-DD
+            category TEXT NOT NULL,
+            created INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            total_minutes REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, category)
+        ) WITHOUT ROWID
+    ''')
+    _create_daily_stats_triggers(conn, _JULIAN_MINUTES, ("completed_at", "created_at"))
+    _fill_daily_stats(conn, _JULIAN_MINUTES)
+
+def _create_daily_stats_triggers(conn, minutes, minutes_columns):
+    """Triggers keeping daily_stats current; minutes_columns feed `minutes`"""
+    # Each trigger body adds (sign = 1) or removes (sign = -1) one task's
+    # contribution to the created and completed sides of the rollup
+    def created_side(row, sign):
+        return f'''
+            INSERT INTO daily_stats (day, category, created)
+            SELECT {row}.created_date, COALESCE({row}.category, 'General'), {sign}
+            WHERE {row}.created_date IS NOT NULL
+            ON CONFLICT (day, category) DO UPDATE SET created = created + ({sign});
+        '''
+
+    def completed_side(row, sign):
+        return f'''
+            INSERT INTO daily_stats (day, category, completed, total_minutes)
+            SELECT {row}.completed_date, COALESCE({row}.category, 'General'),
+                   {sign}, ({sign}) * {minutes.format(t=row)}
+            WHERE {row}.completed_date IS NOT NULL
+            ON CONFLICT (day, category) DO UPDATE
+            SET completed = completed + ({sign}),
+                total_minutes = total_minutes + excluded.total_minutes;
+        '''
+
+    conn.execute(f'''
+        CREATE TRIGGER trg_daily_stats_insert AFTER INSERT ON tasks BEGIN
+            {created_side("NEW", 1)}
+            {completed_side("NEW", 1)}
+        END
+    ''')
+    if _has_table(conn, "tasks_archive"):
+        # Rows moving to the archive keep counting; deleting them there doesn't
+        conn.execute(f'''
+            CREATE TRIGGER trg_daily_stats_delete AFTER DELETE ON tasks
+            WHEN NOT EXISTS (SELECT 1 FROM tasks_archive WHERE id = OLD.id)
+            BEGIN
+                {created_side("OLD", -1)}
+                {completed_side("OLD", -1)}
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER trg_daily_stats_archive_delete AFTER DELETE ON tasks_archive BEGIN
+                {created_side("OLD", -1)}
+                {completed_side("OLD", -1)}
+            END
+        ''')
+    else:
+        conn.execute(f'''
+            CREATE TRIGGER trg_daily_stats_delete AFTER DELETE ON tasks BEGIN
+                {created_side("OLD", -1)}
+                {completed_side("OLD", -1)}
+            END
+        ''')
+    conn.execute(f'''
+        CREATE TRIGGER trg_daily_stats_created AFTER UPDATE OF created_date, category ON tasks
+        WHEN OLD.created_date IS NOT NEW.created_date OR OLD.category IS NOT NEW.category
+        BEGIN
+            {created_side("OLD", -1)}
+            {created_side("NEW", 1)}
+        END
+    ''')
+    watched = ("completed_date", "category") + minutes_columns
+    changed = "\n          OR ".join(f"OLD.{col} IS NOT NEW.{col}" for col in watched)
+    conn.execute(f'''
+        CREATE TRIGGER trg_daily_stats_completed
+        AFTER UPDATE OF {", ".join(watched)} ON tasks
+        WHEN {changed}
+        BEGIN
+            {completed_side("OLD", -1)}
+            {completed_side("NEW", 1)}
+        END
+    ''')
+
+def fts5_available(conn):
+    """True when this SQLite build has the FTS5 extension"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+@migration(6, "full-text search over tasks and plans")
+def create_search_index(conn):
+    if not fts5_available(conn):
+        # Search falls back to LIKE matching without the index
+        print("[Database] SQLite was built without FTS5 - search will be slower")
+        return
+
+    for table, columns in (("tasks", ("title", "description")),
+                           ("plans", ("heading", "description"))):
+        cols = ", ".join(columns)
+        new_values = ", ".join(f"NEW.{col}" for col in columns)
+        assignments = ", ".join(f"{col} = NEW.{col}" for col in columns)
+
+        # The index keeps its own copy of the text, keyed by the row id
+        conn.execute(f'''
+            CREATE VIRTUAL TABLE {table}_fts USING fts5(
+                {cols}, tokenize = 'unicode61 remove_diacritics 2'
+            )
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER trg_{table}_fts_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {table}_fts (rowid, {cols}) VALUES (NEW.id, {new_values});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER trg_{table}_fts_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM {table}_fts WHERE rowid = OLD.id;
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER trg_{table}_fts_update AFTER UPDATE OF {cols} ON {table} BEGIN
+                UPDATE {table}_fts SET {assignments} WHERE rowid = NEW.id;
+            END
+        ''')
+        conn.execute(f"INSERT INTO {table}_fts (rowid, {cols}) SELECT id, {cols} FROM {table}")
+
+@migration(7, "settings table and watermark-based task hiding")
+def add_hide_watermark(conn):
+    conn.execute('''
+        CREATE TABLE settings (
+            key TEXT PRIMARY KEY,
+            value
+        ) WITHOUT ROWID
+    ''')
+    # Tasks with id <= hide_watermark are hidden unless tasks.hidden says
+    # otherwise: NULL follows the watermark, 1 = hidden, 0 = shown
+    conn.execute("INSERT INTO settings (key, value) VALUES ('hide_watermark', 0)")
+
+    # Existing hidden=1 rows stay as overrides; everything else follows the
+    # watermark (completed tasks are never hidden)
+    conn.execute("UPDATE tasks SET hidden = NULL WHERE hidden = 0 OR status = 'Done'")
+
+# Whole seconds between two ISO timestamp columns
+_SECONDS_BETWEEN = "CAST(ROUND((julianday({end}) - julianday({start})) * 86400) AS INTEGER)"
+
+@migration(8, "stored duration_seconds and active_seconds")
+def add_duration_columns(conn):
+    # Creation -> completion, and start -> completion once a task was started
+    conn.execute("ALTER TABLE tasks ADD COLUMN duration_seconds INTEGER")
+    conn.execute("ALTER TABLE tasks ADD COLUMN active_seconds INTEGER")
+    conn.execute(f'''
+        UPDATE tasks
+        SET duration_seconds = {_SECONDS_BETWEEN.format(start="created_at", end="completed_at")},
+            active_seconds = CASE WHEN started_at IS NOT NULL
+                THEN {_SECONDS_BETWEEN.format(start="started_at", end="completed_at")} END
+        WHERE status = 'Done' AND completed_at IS NOT NULL AND created_at IS NOT NULL
+    ''')
+    # Percentile lookups walk these indexes instead of sorting
+    conn.execute('''
+        CREATE INDEX idx_tasks_duration ON tasks(duration_seconds)
+        WHERE duration_seconds IS NOT NULL
+    ''')
+    conn.execute('''
+        CREATE INDEX idx_tasks_active ON tasks(active_seconds)
+        WHERE active_seconds IS NOT NULL
+    ''')
+
+    # The rollup now sums the stored column
+    for trigger in ("insert", "delete", "created", "completed"):
+        conn.execute(f"DROP TRIGGER trg_daily_stats_{trigger}")
+    _create_daily_stats_triggers(conn, _STORED_MINUTES, ("duration_seconds",))
+    fill_daily_stats(conn)
+
+# Columns tasks and tasks_archive share, in all_tasks order
+_TASK_COLUMNS = (
+    "id, title, description, status, category, priority, "
+    "created_at, started_at, completed_at, hidden, "
+    "created_date, created_hour, started_date, started_hour, "
+    "completed_date, completed_hour, duration_seconds, active_seconds"
+)
+
+@migration(9, "tasks_archive for old completed tasks")
+def create_task_archive(conn):
+    # Same columns as tasks. Ids come from tasks' AUTOINCREMENT sequence, so
+    # an archived id is never handed out again.
+    conn.execute('''
+        CREATE TABLE tasks_archive (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT,
+            category TEXT,
+            priority TEXT,
+            created_at TEXT,
+            started_at TEXT,
+            completed_at TEXT,
+            hidden INTEGER,
+            created_date TEXT,
+            created_hour INTEGER,
+            started_date TEXT,
+            started_hour INTEGER,
+            completed_date TEXT,
+            completed_hour INTEGER,
+            duration_seconds INTEGER,
+            active_seconds INTEGER
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX idx_tasks_archive_duration ON tasks_archive(duration_seconds)
+        WHERE duration_seconds IS NOT NULL
+    ''')
+    conn.execute('''
+        CREATE INDEX idx_tasks_archive_active ON tasks_archive(active_seconds)
+        WHERE active_seconds IS NOT NULL
+    ''')
+    conn.execute(f'''
+        CREATE VIEW all_tasks AS
+        SELECT {_TASK_COLUMNS} FROM tasks
+        UNION ALL
+        SELECT {_TASK_COLUMNS} FROM tasks_archive
+    ''')
+
+    # Completed tasks older than this many days are archived (0 = never)
+    conn.execute("INSERT INTO settings (key, value) VALUES ('archive_after_days', 90)")
+
+    # Archiving deletes from tasks - the rollup and the search index must
+    # only forget a task when it is deleted for good
+    for trigger in ("insert", "delete", "created", "completed"):
+        conn.execute(f"DROP TRIGGER trg_daily_stats_{trigger}")
+    _create_daily_stats_triggers(conn, _STORED_MINUTES, ("duration_seconds",))
+
+    if _has_table(conn, "tasks_fts"):
+        conn.execute("DROP TRIGGER trg_tasks_fts_delete")
+        conn.execute('''
+            CREATE TRIGGER trg_tasks_fts_delete AFTER DELETE ON tasks
+            WHEN NOT EXISTS (SELECT 1 FROM tasks_archive WHERE id = OLD.id)
+            BEGIN
+                DELETE FROM tasks_fts WHERE rowid = OLD.id;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER trg_tasks_archive_fts_delete AFTER DELETE ON tasks_archive BEGIN
+                DELETE FROM tasks_fts WHERE rowid = OLD.id;
+            END
+        ''')
+
+# ALTER TABLE ... DROP COLUMN needs SQLite 3.35 (RENAME COLUMN 3.25), newer
+# than the library some Python builds ship with, so columns are removed or
+# retyped by rebuilding the table: create a copy with the new columns, fill
+# it, drop the old table, rename the copy.
+
+@contextmanager
+def _triggers_dropped(conn):
+    """Drop every trigger for the duration of a with-block, then restore them
+
+    Triggers on other tables can name a table being rebuilt, and the final
+    rename would fail on them while the table is missing.
+    """
+    triggers = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"
+    ).fetchall()
+    for name, _ in triggers:
+        conn.execute(f"DROP TRIGGER {name}")
+    yield
+    for _, sql in triggers:
+        conn.execute(sql)
+
+def _rebuild_table(conn, table, drop=(), retype=None):
+    """Recreate table without the `drop` columns, keeping its rows and indexes
+
+    retype maps a column to (new type, SQL computing its value from the old
+    row). Run inside _triggers_dropped().
+    """
+    retype = retype or {}
+    table_sql = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()[0]
+    indexes = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)
+    )]
+
+    definitions, names, values = [], [], []
+    for _, name, col_type, notnull, default, pk in conn.execute(f"PRAGMA table_info({table})"):
+        if name in drop:
+            continue
+        col_type, value = retype.get(name, (col_type, name))
+        definition = f"{name} {col_type}".rstrip()
+        if pk:
+            definition += " PRIMARY KEY"
+            if "AUTOINCREMENT" in table_sql.upper():
+                definition += " AUTOINCREMENT"
+        if notnull:
+            definition += " NOT NULL"
+        if default is not None:
+            definition += f" DEFAULT {default}"
+        definitions.append(definition)
+        names.append(name)
+        values.append(value)
+
+    # AUTOINCREMENT must keep skipping the ids of rows deleted before now
+    sequence = None
+    if _has_table(conn, "sqlite_sequence"):
+        sequence = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)
+        ).fetchone()
+
+    rebuilt = f"{table}_rebuilt"
+    conn.execute(f"CREATE TABLE {rebuilt} ({', '.join(definitions)})")
+    conn.execute(
+        f"INSERT INTO {rebuilt} ({', '.join(names)}) SELECT {', '.join(values)} FROM {table}"
+    )
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {rebuilt} RENAME TO {table}")
+    if sequence:
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (table,))
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, sequence[0]))
+    for sql in indexes:
+        conn.execute(sql)
+
+# tasks / tasks_archive columns once descriptions moved out (all_tasks order)
+_ROW_COLUMNS = (
+    "id, title, status, category, priority, "
+    "created_at, started_at, completed_at, hidden, "
+    "created_date, created_hour, started_date, started_hour, "
+    "completed_date, completed_hour, duration_seconds, active_seconds"
+)
+
+@migration(10, "descriptions moved to task_descriptions")
+def move_task_descriptions(conn):
+    # Long notes made every tasks row wide; listings and aggregates now read
+    # fixed-width rows and fetch the text by id only where it is shown.
+    # Keyed by task id for live and archived tasks alike.
+    conn.execute('''
+        CREATE TABLE task_descriptions (
+            task_id INTEGER PRIMARY KEY,
+            description TEXT NOT NULL
+        )
+    ''')
+    for table in ("tasks", "tasks_archive"):
+        conn.execute(f'''
+            INSERT INTO task_descriptions (task_id, description)
+            SELECT id, description FROM {table}
+            WHERE description IS NOT NULL AND description != ''
+        ''')
+
+    # Nothing may reference the column while it is dropped
+    conn.execute("DROP VIEW all_tasks")
+    search = _has_table(conn, "tasks_fts")
+    if search:
+        conn.execute("DROP TRIGGER trg_tasks_fts_insert")
+        conn.execute("DROP TRIGGER trg_tasks_fts_update")
+    with _triggers_dropped(conn):
+        for table in ("tasks", "tasks_archive"):
+            _rebuild_table(conn, table, drop=("description",))
+    conn.execute(f'''
+        CREATE VIEW all_tasks AS
+        SELECT {_ROW_COLUMNS} FROM tasks
+        UNION ALL
+        SELECT {_ROW_COLUMNS} FROM tasks_archive
+    ''')
+
+    # A description goes when its task is deleted for good (not archived)
+    conn.execute('''
+        CREATE TRIGGER trg_tasks_description_delete AFTER DELETE ON tasks
+        WHEN NOT EXISTS (SELECT 1 FROM tasks_archive WHERE id = OLD.id)
+        BEGIN
+            DELETE FROM task_descriptions WHERE task_id = OLD.id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER trg_tasks_archive_description_delete AFTER DELETE ON tasks_archive BEGIN
+            DELETE FROM task_descriptions WHERE task_id = OLD.id;
+        END
+    ''')
+
+    if search:
+        # The index row starts with the title; the description fills in
+        # when (and if) its row is written
+        conn.execute('''
+            CREATE TRIGGER trg_tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, title) VALUES (NEW.id, NEW.title);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER trg_tasks_fts_update AFTER UPDATE OF title ON tasks BEGIN
+                UPDATE tasks_fts SET title = NEW.title WHERE rowid = NEW.id;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER trg_task_descriptions_fts_insert AFTER INSERT ON task_descriptions BEGIN
+                UPDATE tasks_fts SET description = NEW.description WHERE rowid = NEW.task_id;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER trg_task_descriptions_fts_update AFTER UPDATE OF description ON task_descriptions BEGIN
+                UPDATE tasks_fts SET description = NEW.description WHERE rowid = NEW.task_id;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER trg_task_descriptions_fts_delete AFTER DELETE ON task_descriptions BEGIN
+                UPDATE tasks_fts SET description = NULL WHERE rowid = OLD.task_id;
+            END
+        ''')
+
+@migration(11, "integer epoch timestamps and the database timezone")
+def convert_timestamps_to_epoch(conn):
+    # The ISO strings were naive local times from datetime.now(); SQLite's
+    # 'utc' modifier reads them in this machine's zone, which wrote them
+    conn.execute("DROP VIEW all_tasks")
+    with _triggers_dropped(conn):
+        for table, columns in (("tasks", ("created_at", "started_at", "completed_at")),
+                               ("tasks_archive", ("created_at", "started_at", "completed_at")),
+                               ("plans", ("created_at", "updated_at"))):
+            # Same names, INTEGER affinity - a TEXT column would store the
+            # numbers back as strings. One rebuild per table.
+            _rebuild_table(conn, table, retype={
+                col: ("INTEGER", f"CAST(strftime('%s', {col}, 'utc') AS INTEGER)")
+                for col in columns
+            })
+
+    conn.execute(f'''
+        CREATE VIEW all_tasks AS
+        SELECT {_ROW_COLUMNS} FROM tasks
+        UNION ALL
+        SELECT {_ROW_COLUMNS} FROM tasks_archive
+    ''')
+
+    # The zone the stored *_date/*_hour columns are in. New rows keep using
+    # it even if the machine's zone changes later.
+    conn.execute(
+        "INSERT INTO settings (key, value) VALUES ('timezone', ?)",
+        (system_timezone_name(),)
+    )
@@ -1,84 +1,90 @@
 # planner_db.py - Database operations for plans
-import sqlite3
-from datetime import datetime
+from database import get_connection, write_transaction
+from migrations import migrate
+from records import Plan, record_factory, select_columns
+from query_cache import reads, writes
+from events import publish, CREATED, UPDATED, DELETED
+import timestamps
 
 DB_FILE = "tasks.db"  # Same database, new table
 
 def init_planner_table():
-    """Create plans table if it doesn't exist"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS plans (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            heading TEXT NOT NULL,
-            description TEXT,
-            focus_area TEXT DEFAULT 'General',
-            priority TEXT DEFAULT 'Medium',
-            time_frame TEXT NOT NULL,  -- 'Week' or 'Month'
-            created_at TEXT,
-            updated_at TEXT,
-            status TEXT DEFAULT 'Active'
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    """Make sure the plans table exists (see migrations.py)"""
+    migrate(get_connection(DB_FILE))
+
+def _connection():
+    """This thread's connection to the plans database"""
+    return get_connection(DB_FILE)
 
+@writes("plans")
 def add_plan(heading, description, focus_area, priority, time_frame):
     """Add a new plan"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    now = datetime.now().isoformat()
+    conn = get_connection(DB_FILE)
+    now = timestamps.now()
     
-    c.execute('''
-        INSERT INTO plans 
-        (heading, description, focus_area, priority, time_frame, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (heading, description, focus_area, priority, time_frame, now, now))
-    
-    plan_id = c.lastrowid
-    conn.commit()
-    conn.close()
+    with write_transaction(conn) as c:
+        c.execute('''
+            INSERT INTO plans 
+            (heading, description, focus_area, priority, time_frame, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (heading, description, focus_area, priority, time_frame, now, now))
+        
+        plan_id = c.lastrowid
+    publish("plan", CREATED, (plan_id,))
     return plan_id
 
-def list_plans(time_frame=None):
-    """Get all plans, optionally filtered by Week/Month"""
-    conn = sqlite3.connect(DB_FILE)
+# Row factory for plans queries - rows come back as Plan records
+_plan_row = record_factory(Plan)
+
+@reads("plans", connect=_connection)
+def list_plans(time_frame=None, columns=None):
+    """Get all plans, optionally filtered by Week/Month
+    
+    Args:
+        time_frame: 'Week', 'Month' or None for both
+        columns: Optional Plan field names to load (others are None)
+    
+    Returns:
+        list[Plan]
+    """
+    conn = get_connection(DB_FILE)
     c = conn.cursor()
+    c.row_factory = _plan_row
+    cols = select_columns(Plan, columns)
     
     if time_frame:
-        c.execute('SELECT * FROM plans WHERE time_frame = ? ORDER BY id DESC', (time_frame,))
+        c.execute(f'SELECT {cols} FROM plans WHERE time_frame = ? ORDER BY id DESC', (time_frame,))
     else:
-        c.execute('SELECT * FROM plans ORDER BY id DESC')
+        c.execute(f'SELECT {cols} FROM plans ORDER BY id DESC')
     
-    plans = c.fetchall()
-    conn.close()
-    return plans
+    return c.fetchall()
 
+@writes("plans")
 def update_plan(plan_id, heading, description, focus_area, priority, time_frame):
     """Update an existing plan"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    now = datetime.now().isoformat()
+    conn = get_connection(DB_FILE)
+    now = timestamps.now()
     
-    c.execute('''
-        UPDATE plans 
-        SET heading = ?, description = ?, focus_area = ?, 
-            priority = ?, time_frame = ?, updated_at = ?
-        WHERE id = ?
-    ''', (heading, description, focus_area, priority, time_frame, now, plan_id))
+    with write_transaction(conn) as c:
+        c.execute('''
+            UPDATE plans 
+            SET heading = ?, description = ?, focus_area = ?, 
+                priority = ?, time_frame = ?, updated_at = ?
+            WHERE id = ?
+        ''', (heading, description, focus_area, priority, time_frame, now, plan_id))
     
-    conn.commit()
-    conn.close()
+    if c.rowcount:
+        publish("plan", UPDATED, (plan_id,))
     return True
 
+@writes("plans")
 def delete_plan(plan_id):
     """Delete a plan"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('DELETE FROM plans WHERE id = ?', (plan_id,))
-    conn.commit()
-    conn.close()
+    conn = get_connection(DB_FILE)
+    with write_transaction(conn) as c:
+        c.execute('DELETE FROM plans WHERE id = ?', (plan_id,))
+    if c.rowcount:
+        publish("plan", DELETED, (plan_id,))
     return True
 
 # ============================================================================
@@ -6,9 +6,10 @@ from tkinter import messagebox, ttk
 from datetime import datetime
 from planner_db import list_plans, add_plan, update_plan, delete_plan
 from app_state import AppState, hide_main_view, show_main_view, close_sidebar
+from events import subscribe, DELETED
 
 class PlannerWindow:
-    def __init__(self, parent, main_container):
+    def __init__(self, parent, main_container, dispatch=None):
         self.parent = parent
         self.main_container = main_container
         self.window = None
@@ -17,6 +18,10 @@ class PlannerWindow:
         self.month_frame = None
         self.week_content = None
         self.month_content = None
+        self.plan_cards = {}        # plan id -> card frame currently shown
+        
+        # Keep the open planner in step with plan changes from anywhere
+        subscribe(self.on_plan_change, entity="plan", dispatch=dispatch)
         
         # Colors - Match Analytics dashboard exactly
         self.BG_LIGHT = "#f8fafc"
@@ -465,12 +470,9 @@ class PlannerWindow:
             priority = priority_var.get()
             time_frame = time_frame_var.get()
             
-            # Save to database
+            # Save to database - on_plan_change() updates the view
             add_plan(heading, description, focus, priority, time_frame)
             
-            # Refresh the view
-            self.refresh_plans()
-            
             dialog.destroy()
         
         def cancel():
@@ -510,8 +512,29 @@ class PlannerWindow:
         dialog.bind('<Return>', lambda e: submit())
         dialog.bind('<Escape>', lambda e: cancel())
     
+    def on_plan_change(self, event):
+        """Patch the open planner after a plan change event"""
+        if not (self.window and self.window.winfo_exists()):
+            return  # Reloaded from the database when next opened
+        
+        if event.kind == DELETED:
+            for plan_id in event.ids:
+                card = self.plan_cards.pop(plan_id, None)
+                if card is not None:
+                    card.destroy()
+            # An emptied tab needs its empty-state message
+            for content in (self.week_content, self.month_content):
+                if not content.winfo_children():
+                    self.refresh_plans()
+                    break
+        else:
+            # New or edited plans can move within the sorted lists
+            self.refresh_plans()
+    
     def refresh_plans(self):
         """Refresh both Week and Month tabs"""
+        self.plan_cards = {}
+        
         # Clear existing content
         if hasattr(self, 'week_content'):
             for widget in self.week_content.winfo_children():
@@ -540,13 +563,13 @@ class PlannerWindow:
     
     def create_plan_card(self, parent, plan, index):
         """Create a card to display a plan"""
-        # Plan structure: (id, heading, description, focus_area, priority, time_frame, created_at, updated_at, status)
-        plan_id = plan[0]
-        heading = plan[1]
-        description = plan[2] if plan[2] else ""
-        focus = plan[3]
-        priority = plan[4]
-        time_frame = plan[5]
+        # plan is a records.Plan
+        plan_id = plan.id
+        heading = plan.heading
+        description = plan.description if plan.description else ""
+        focus = plan.focus_area
+        priority = plan.priority
+        time_frame = plan.time_frame
         
         # Card frame
         card = tk.Frame(
@@ -558,6 +581,7 @@ class PlannerWindow:
             highlightthickness=1
         )
         card.pack(fill="x", padx=5, pady=6)
+        self.plan_cards[plan_id] = card
         
         # Content area
         content = tk.Frame(card, bg=self.CARD_BG)
@@ -726,7 +750,6 @@ class PlannerWindow:
             parent=self.window
         ):
             delete_plan(plan_id)
-            self.refresh_plans()
     
     def show_edit_dialog(self, plan):
         """Show dialog to edit an existing plan"""
@@ -0,0 +1,144 @@
+# query_cache.py - Memoized read results with write-driven invalidation
+# Every table has a version number. Read functions declare the tables they
+# read and their results are kept until one of those versions moves; write
+# functions declare the tables they change and bump them. Commits from other
+# processes are caught with PRAGMA data_version, which changes whenever
+# another connection commits to the database file.
+#
+#   @reads("tasks", connect=lambda: get_connection(DB_FILE))
+#   def get_hidden_count(): ...
+#
+#   @writes("tasks")
+#   def mark_done(task_id): ...
+
+import functools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+CACHE_SIZE = 256  # Results kept before the least recently used is dropped
+
+class QueryCache:
+    """Size-bounded LRU of read results, invalidated per table"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()            # key -> (versions, result)
+        self._versions = {}                      # table -> write version
+        self._epoch = 0                          # bumped by invalidate()
+        self._local = threading.local()          # per-thread {conn: last data_version}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables):
+        """Record a write to tables - cached reads of them go stale"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def invalidate(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def _check_external(self, conn):
+        """Invalidate everything if another connection committed since last look
+
+        A connection seen for the first time has no baseline, so entries
+        cached by other threads can't be trusted - they may predate a commit
+        from another process.
+        """
+        seen = getattr(self._local, "data_versions", None)
+        if seen is None:
+            seen = self._local.data_versions = {}
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        last = seen.get(conn)
+        seen[conn] = data_version
+        if last != data_version:
+            self.invalidate()
+
+    def _snapshot(self, tables):
+        return (self._epoch,) + tuple(self._versions.get(t, 0) for t in tables)
+
+    def reads(self, *tables, connect):
+        """Decorator: cache a read function's results until tables change
+
+        connect() returns the connection the function reads through. Results
+        are shared between callers and must be treated as read-only.
+        """
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+                try:
+                    hash(key)
+                except TypeError:
+                    return func(*args, **kwargs)  # e.g. columns passed as a list
+
+                self._check_external(connect())
+                with self._lock:
+                    versions = self._snapshot(tables)
+                    entry = self._entries.get(key)
+                    if entry is not None and entry[0] == versions:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return entry[1]
+                    self.misses += 1
+
+                # Versions were taken before the query, so a write that lands
+                # while it runs leaves this entry stale rather than wrong
+                result = func(*args, **kwargs)
+                with self._lock:
+                    self._entries[key] = (versions, result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                return result
+            return wrapper
+        return decorate
+
+    def writes(self, *tables):
+        """Decorator: bump tables' versions around a write function"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                # Before: readers running during the write won't store their
+                # result under the final version. After: the commit is visible.
+                self.bump(*tables)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.bump(*tables)
+            return wrapper
+        return decorate
+
+    def info(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total * 100 if total else 0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    @contextmanager
+    def disabled(self):
+        """Bypass the cache inside a with-block (e.g. to trace real queries)"""
+        previous, self.enabled = self.enabled, False
+        try:
+            yield
+        finally:
+            self.enabled = previous
+
+# One cache shared by tasks.py and planner_db.py (they use the same database)
+cache = QueryCache()
+reads = cache.reads
+writes = cache.writes
@@ -0,0 +1,99 @@
+# records.py - Typed, immutable row records for tasks and plans
+# Records are NamedTuples: no per-instance __dict__, read-only fields, and
+# they still unpack like the plain tuples older code expects. *_at fields are
+# epoch seconds (see timestamps.py).
+
+from operator import itemgetter
+from typing import NamedTuple, Optional
+
+class Task(NamedTuple):
+    """One row of the tasks table (fields not selected stay None)"""
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[str] = None
+    category: Optional[str] = None
+    priority: Optional[str] = None
+    created_at: Optional[int] = None
+    started_at: Optional[int] = None
+    completed_at: Optional[int] = None
+    hidden: Optional[int] = None
+    created_date: Optional[str] = None
+    created_hour: Optional[int] = None
+    started_date: Optional[str] = None
+    started_hour: Optional[int] = None
+    completed_date: Optional[str] = None
+    completed_hour: Optional[int] = None
+    duration_seconds: Optional[int] = None  # Created -> completed
+    active_seconds: Optional[int] = None    # Started -> completed
+
+class Plan(NamedTuple):
+    """One row of the plans table (fields not selected stay None)"""
+    id: int
+    heading: Optional[str] = None
+    description: Optional[str] = None
+    focus_area: Optional[str] = None
+    priority: Optional[str] = None
+    time_frame: Optional[str] = None
+    created_at: Optional[int] = None
+    updated_at: Optional[int] = None
+    status: Optional[str] = None
+
+def select_columns(record_type, columns=None, expressions=None):
+    """Validated SQL column list for record_type (all fields by default)
+
+    Queries name their columns instead of SELECT *, so columns added to a
+    table later are never dragged through listings that don't need them.
+    expressions maps fields that aren't stored on the row to the SQL that
+    fetches them, selected as "<sql> AS <field>".
+    """
+    if columns is None:
+        columns = record_type._fields
+    else:
+        unknown = [col for col in columns if col not in record_type._fields]
+        if unknown:
+            raise ValueError(f"Unknown {record_type.__name__} column(s): {', '.join(unknown)}")
+        if "id" not in columns:
+            columns = ("id",) + tuple(columns)
+    if expressions:
+        return ", ".join(f"{expressions[col]} AS {col}" if col in expressions else col
+                         for col in columns)
+    return ", ".join(columns)
+
+def _builder(record_type, columns):
+    """Return a function turning a row with these columns into a record"""
+    if columns == record_type._fields:
+        return record_type._make
+
+    # Missing fields read the None appended at index len(columns)
+    missing = len(columns)
+    getter = itemgetter(*[columns.index(f) if f in columns else missing for f in record_type._fields])
+    make = record_type._make
+    return lambda row: make(getter(row + (None,)))
+
+def record_factory(record_type):
+    """sqlite3 row factory producing record_type instances
+
+    The column mapping is worked out once per executed statement (cursor
+    description), not once per row.
+    """
+    cached = [(None, None)]
+
+    def factory(cursor, row):
+        description, build = cached[0]
+        if description is not cursor.description:
+            description = cursor.description
+            build = _builder(record_type, tuple(col[0] for col in description))
+            cached[0] = (description, build)
+        return build(row)
+
+    return factory
+
+class SearchResult(NamedTuple):
+    """One full-text search hit - a task or a plan"""
+    kind: str           # 'task' or 'plan'
+    id: int
+    title: str
+    snippet: str        # Matching text with [brackets] around the hits
+    status: Optional[str]
+    rank: float         # bm25 score, lower is better
@@ -1,9 +1,17 @@
 # tasks.py - Database operations for Tasky
 # UPDATED: Added hidden column for permanent task hiding
+# UPDATED: Schema changes now live in migrations.py
 # FIXED: Removed duplicate datetime import inside get_weekly_performance()
 
-import sqlite3
 from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+from database import get_connection, write_transaction
+from migrations import migrate, fill_daily_stats
+from records import Task, SearchResult, record_factory, select_columns
+from query_cache import cache, reads, writes
+from events import publish, CREATED, UPDATED, DELETED, HIDDEN, SHOWN
+import timestamps
 
 DB_FILE = "tasks.db"
 
@@ -11,227 +19,596 @@ DB_FILE = "tasks.db"
 # DATABASE INITIALIZATION
 # ============================================================================
 
-def add_hidden_column_if_not_exists():
-    """Add hidden column to existing tables (for upgrading old databases)"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
-    # Check if column exists
-    c.execute("PRAGMA table_info(tasks)")
-    columns = [col[1] for col in c.fetchall()]
-    
-    if 'hidden' not in columns:
-        print("[Database] Adding 'hidden' column to tasks table...")
-        c.execute("ALTER TABLE tasks ADD COLUMN hidden INTEGER DEFAULT 0")
-        conn.commit()
-        print("[Database] Schema updated successfully")
-    else:
-        print("[Database] 'hidden' column already exists")
-    
-    conn.close()
-
 def create_table():
-    """Create tasks table with hidden column"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
-    # Create table with hidden column (if not exists)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            description TEXT,
-            status TEXT DEFAULT 'Pending',
-            category TEXT DEFAULT 'General',
-            priority TEXT DEFAULT 'Medium',
-            created_at TEXT,
-            started_at TEXT,
-            completed_at TEXT,
-            hidden INTEGER DEFAULT 0
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-    
-    # For existing databases, add the hidden column if needed
-    add_hidden_column_if_not_exists()
+    """Bring the tasks schema up to date (one PRAGMA read when current)"""
+    migrate(get_connection(DB_FILE))
+
+def _connection():
+    """This thread's connection to the tasks database"""
+    return get_connection(DB_FILE)
+
+# Timestamps are epoch seconds, so durations are a plain subtraction from
+# the bound completion time
+_SET_DURATIONS = '''duration_seconds = ? - created_at,
+            active_seconds = ? - started_at'''
+
+_timezones = {}  # DB_FILE -> tzinfo (None = system zone)
+
+def _timezone():
+    """The timezone recorded in the database (read once per database file)"""
+    if DB_FILE not in _timezones:
+        row = get_connection(DB_FILE).execute(
+            "SELECT value FROM settings WHERE key = 'timezone'"
+        ).fetchone()
+        _timezones[DB_FILE] = timestamps.get_timezone(row[0] if row else None)
+    return _timezones[DB_FILE]
+
+def _today():
+    """Today's date in the database's timezone"""
+    return timestamps.today(_timezone())
+
+def _local_now():
+    """Current time as (epoch seconds, local date, local hour)
+
+    The date and hour are stored next to each timestamp so analytics can
+    filter on plain indexed columns by calendar day.
+    """
+    return timestamps.local_parts(_timezone())
 
 # ============================================================================
 # CORE TASK OPERATIONS
 # ============================================================================
 
+@writes("tasks")
 def add_task(title, description="", category="General", priority="Medium"):
     """Add a new task (visible by default)"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    now = datetime.now().isoformat()
+    conn = get_connection(DB_FILE)
+    now, day, hour = _local_now()
     
-    c.execute('''
-        INSERT INTO tasks 
-        (title, description, category, priority, status, created_at, hidden)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (title, description, category, priority, "Pending", now, 0))
-    
-    task_id = c.lastrowid
-    conn.commit()
-    conn.close()
+    with write_transaction(conn) as c:
+        c.execute('''
+            INSERT INTO tasks 
+            (title, category, priority, status, created_at,
+             created_date, created_hour, hidden)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (title, category, priority, "Pending", now, day, hour, None))
+        
+        task_id = c.lastrowid
+        if description:
+            c.execute(
+                "INSERT INTO task_descriptions (task_id, description) VALUES (?, ?)",
+                (task_id, description)
+            )
+    publish("task", CREATED, (task_id,))
     return task_id
 
-def list_tasks(include_hidden=False):
-    """Get tasks - by default, only visible ones (hidden=0)
+# Row factory for tasks queries - rows come back as Task records
+_task_row = record_factory(Task)
+
+# Descriptions live in task_descriptions, keyed by task id, so tasks rows
+# stay narrow; only queries that ask for the field look them up
+_TASK_EXPRESSIONS = {
+    "description": "COALESCE((SELECT description FROM task_descriptions WHERE task_id = id), '')",
+}
+
+# Task fields stored on the tasks (and tasks_archive) row itself
+_ROW_COLUMNS = tuple(field for field in Task._fields if field not in _TASK_EXPRESSIONS)
+
+def _task_columns(columns=None):
+    """SELECT list for Task fields (see records.select_columns)"""
+    return select_columns(Task, columns, _TASK_EXPRESSIONS)
+
+# Fields a TaskCard actually shows (the duration is stored, no timestamps needed)
+CARD_COLUMNS = ("id", "title", "description", "status", "category", "priority",
+                "duration_seconds")
+
+def _task_cursor():
+    conn = get_connection(DB_FILE)
+    c = conn.cursor()
+    c.row_factory = _task_row
+    return c
+
+# Hide-all stores a watermark instead of flagging every row: tasks with
+# id <= hide_watermark are hidden. tasks.hidden is a per-task override -
+# NULL follows the watermark, 1 = hidden, 0 = shown.
+_WATERMARK = "(SELECT value FROM settings WHERE key = 'hide_watermark')"
+
+_VISIBLE_TASKS = f'''(
+    SELECT * FROM tasks
+    WHERE status != 'Done' AND hidden IS NULL AND id > {_WATERMARK}
+    UNION ALL
+    SELECT * FROM tasks WHERE status != 'Done' AND hidden = 0
+)'''
+
+_HIDDEN_CONDITION = f"(hidden = 1 OR (hidden IS NULL AND id <= {_WATERMARK}))"
+
+def _task_source(include_hidden=False, include_done=False):
+    """FROM target shared by the listing functions
+    
+    Visible tasks are read as two index range scans (above the watermark,
+    plus the few shown overrides) that SQLite merges in id order. Listings
+    that include completed tasks read all_tasks, which adds the archive.
+    """
+    if include_done:
+        return "all_tasks"
+    if include_hidden:
+        return "(SELECT * FROM tasks WHERE status != 'Done')"
+    return _VISIBLE_TASKS
+
+@reads("tasks", connect=_connection)
+def list_tasks(include_hidden=False, columns=None):
+    """Get tasks - by default, only visible ones (not hidden)
     
     Args:
         include_hidden (bool): If True, returns ALL incomplete tasks including hidden ones
                               If False, returns only visible incomplete tasks (for main view)
+        columns: Optional Task field names to load (e.g. CARD_COLUMNS);
+                 fields not loaded are None on the returned records
+    
+    Returns:
+        list[Task]
     """
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+    c = _task_cursor()
+    cols = _task_columns(columns)
     
-    if include_hidden:
-        # For Unfinished tab - get ALL incomplete tasks regardless of hidden status
-        c.execute('SELECT * FROM tasks WHERE status != "Done" ORDER BY id DESC')
-    else:
-        # For main view - only visible incomplete tasks
-        c.execute('SELECT * FROM tasks WHERE status != "Done" AND hidden = 0 ORDER BY id DESC')
+    # include_hidden: the Unfinished tab - ALL incomplete tasks regardless of hiding
+    # otherwise: the main view - only visible incomplete tasks
+    c.execute(f"SELECT {cols} FROM {_task_source(include_hidden)} ORDER BY id DESC")
     
-    tasks = c.fetchall()
-    conn.close()
-    return tasks
+    return c.fetchall()
 
-def list_all_tasks():
-    """Get ALL tasks (including completed, including hidden) - for debugging"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('SELECT * FROM tasks ORDER BY id DESC')
-    tasks = c.fetchall()
-    conn.close()
-    return tasks
+@reads("tasks", connect=_connection)
+def list_all_tasks(columns=None):
+    """Get ALL tasks (including completed, hidden and archived) - for debugging"""
+    c = _task_cursor()
+    c.execute(f'SELECT {_task_columns(columns)} FROM all_tasks ORDER BY id DESC')
+    return c.fetchall()
 
-def get_unfinished_tasks():
+def get_unfinished_tasks(columns=None):
     """Get ALL incomplete tasks (including hidden ones) for Unfinished tab"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('SELECT * FROM tasks WHERE status != "Done" ORDER BY id DESC')
+    return list_tasks(include_hidden=True, columns=columns)
+
+def get_tasks(task_ids, include_hidden=False, include_done=False, columns=None):
+    """Get specific tasks, keeping only those the matching listing would show
+    
+    Used to patch a view after a change event: ids missing from the result
+    have dropped out of that view (completed, hidden or deleted).
+    
+    Returns:
+        list[Task], newest first
+    """
+    c = _task_cursor()
+    cols = _task_columns(columns)
+    source = _task_source(include_hidden, include_done)
+    task_ids = list(task_ids)
+    
+    found = []
+    for i in range(0, len(task_ids), _ID_CHUNK):
+        chunk = task_ids[i:i + _ID_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        c.execute(f"SELECT {cols} FROM {source} WHERE id IN ({placeholders})", chunk)
+        found.extend(c.fetchall())
+    found.sort(key=lambda task: task.id, reverse=True)
+    return found
+
+# ============================================================================
+# PAGINATION
+# ============================================================================
+
+PAGE_SIZE = 50  # Tasks per screen in the GUI and per batch when streaming
+
+def _task_page(source, before_id, limit, columns):
+    """Keyset page on id DESC - fetches one extra row to detect the end"""
+    c = _task_cursor()
+    cols = _task_columns(columns)
+    
+    if before_id is None:
+        c.execute(f"SELECT {cols} FROM {source} ORDER BY id DESC LIMIT ?", (limit + 1,))
+    else:
+        c.execute(
+            f"SELECT {cols} FROM {source} WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (before_id, limit + 1)
+        )
+    
     tasks = c.fetchall()
-    conn.close()
-    return tasks
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        return tasks, tasks[-1].id
+    return tasks, None
+
+@reads("tasks", connect=_connection)
+def list_tasks_page(before_id=None, limit=PAGE_SIZE, include_hidden=False, columns=None):
+    """Get one page of incomplete tasks, newest first
+    
+    Args:
+        before_id: Cursor returned with the previous page (None for the first page)
+        limit (int): Page size
+        include_hidden (bool): Same meaning as in list_tasks()
+        columns: Optional Task field names to load, as in list_tasks()
+    
+    Returns:
+        tuple: (tasks, next_cursor) - next_cursor is None on the last page
+    """
+    return _task_page(_task_source(include_hidden), before_id, limit, columns)
+
+@reads("tasks", connect=_connection)
+def list_all_tasks_page(before_id=None, limit=PAGE_SIZE, columns=None):
+    """Get one page of ALL tasks (completed and hidden too), newest first"""
+    return _task_page(_task_source(include_done=True), before_id, limit, columns)
+
+def iter_tasks(include_hidden=False, include_done=False, batch_size=PAGE_SIZE, columns=None):
+    """Stream tasks newest first, pulling batch_size rows at a time
+    
+    Nothing beyond the current batch is held in memory, so callers can show
+    or write the first rows before the rest has been read.
+    """
+    c = _task_cursor()
+    c.arraysize = batch_size
+    c.execute(
+        f"SELECT {_task_columns(columns)} "
+        f"FROM {_task_source(include_hidden, include_done)} ORDER BY id DESC"
+    )
+    
+    while True:
+        rows = c.fetchmany()
+        if not rows:
+            break
+        yield from rows
 
+@writes("tasks", "task_durations")
 def mark_done(task_id):
-    """Mark task as completed and unhide it"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    now = datetime.now().isoformat()
+    """Mark task as completed (completed tasks are never hidden)"""
+    conn = get_connection(DB_FILE)
+    now, day, hour = _local_now()
     
-    # When marking done, also set hidden=0 so completed tasks reappear in main view
-    c.execute('''
-        UPDATE tasks 
-        SET status = 'Done', completed_at = ?, hidden = 0
-        WHERE id = ?
-    ''', (now, task_id))
+    # Clear any hide override - completed tasks don't take part in hiding
+    with write_transaction(conn) as c:
+        c.execute(f'''
+            UPDATE tasks 
+            SET status = 'Done', completed_at = ?, completed_date = ?,
+                completed_hour = ?, hidden = NULL,
+                {_SET_DURATIONS}
+            WHERE id = ?
+        ''', (now, day, hour, now, now, task_id))
     
-    conn.commit()
-    conn.close()
+    if c.rowcount:
+        publish("task", UPDATED, (task_id,))
 
+@writes("tasks", "task_durations")
 def delete_task(task_id):
-    """Permanently delete a task"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
-    conn.commit()
-    conn.close()
+    """Permanently delete a task (archived ones too)"""
+    conn = get_connection(DB_FILE)
+    with write_transaction(conn) as c:
+        c.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+        if not c.rowcount:
+            c.execute('DELETE FROM tasks_archive WHERE id = ?', (task_id,))
+    if c.rowcount:
+        publish("task", DELETED, (task_id,))
 
+@writes("tasks")
 def start_task(task_id):
     """Record when a task was started"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    now = datetime.now().isoformat()
+    conn = get_connection(DB_FILE)
+    now, day, hour = _local_now()
     
-    c.execute('''
-        UPDATE tasks 
-        SET started_at = ? 
-        WHERE id = ? AND started_at IS NULL
-    ''', (now, task_id))
+    with write_transaction(conn) as c:
+        c.execute('''
+            UPDATE tasks 
+            SET started_at = ?, started_date = ?, started_hour = ?
+            WHERE id = ? AND started_at IS NULL
+        ''', (now, day, hour, task_id))
+    
+    if c.rowcount:
+        publish("task", UPDATED, (task_id,))
+
+# ============================================================================
+# BULK OPERATIONS
+# ============================================================================
+# Each bulk call is one transaction: one commit for the whole batch instead
+# of one per task. They return the ids that were actually affected.
+
+_ID_CHUNK = 500  # Stay well below SQLite's bound-parameter limit
+
+def _select_ids(c, task_ids, condition="1 = 1", table="tasks"):
+    """Return the ids from task_ids that exist in table and match condition"""
+    task_ids = list(dict.fromkeys(task_ids))
+    found = set()
+    for i in range(0, len(task_ids), _ID_CHUNK):
+        chunk = task_ids[i:i + _ID_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        c.execute(f"SELECT id FROM {table} WHERE id IN ({placeholders}) AND {condition}", chunk)
+        found.update(row[0] for row in c.fetchall())
+    return [task_id for task_id in task_ids if task_id in found]
+
+@writes("tasks")
+def add_tasks(items):
+    """Add many tasks in one transaction
+    
+    Args:
+        items: Iterable of dicts with add_task() keyword arguments, or tuples
+               of its positional arguments (title, description, category, priority)
+    
+    Returns:
+        list: New task ids, in the same order as items
+    """
+    now, day, hour = _local_now()
+    rows = []
+    for item in items:
+        if isinstance(item, dict):
+            args = (item['title'], item.get('description', ""),
+                    item.get('category', "General"), item.get('priority', "Medium"))
+        else:
+            # Missing trailing arguments take add_task()'s defaults
+            args = tuple(item) + ("", "General", "Medium")[len(item) - 1:]
+        rows.append(args + ("Pending", now, day, hour, None))
+    
+    if not rows:
+        return []
+    
+    # Description goes to task_descriptions, keyed by the id it will get
+    descriptions = [(i, row[1]) for i, row in enumerate(rows) if row[1]]
+    rows = [row[:1] + row[2:] for row in rows]
     
-    conn.commit()
-    conn.close()
+    conn = get_connection(DB_FILE)
+    with write_transaction(conn) as c:
+        # AUTOINCREMENT hands out consecutive ids above the stored sequence,
+        # and the write lock guarantees nobody else inserts meanwhile
+        c.execute('''
+            SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'tasks'), 0),
+                       COALESCE((SELECT MAX(id) FROM tasks), 0))
+        ''')
+        first_id = c.fetchone()[0] + 1
+        c.executemany('''
+            INSERT INTO tasks 
+            (title, category, priority, status, created_at,
+             created_date, created_hour, hidden)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        c.executemany(
+            "INSERT INTO task_descriptions (task_id, description) VALUES (?, ?)",
+            [(first_id + i, description) for i, description in descriptions]
+        )
+    
+    task_ids = list(range(first_id, first_id + len(rows)))
+    publish("task", CREATED, task_ids)
+    return task_ids
+
+@writes("tasks", "task_durations")
+def mark_done_many(task_ids):
+    """Mark many tasks as completed in one transaction"""
+    conn = get_connection(DB_FILE)
+    now, day, hour = _local_now()
+    with write_transaction(conn) as c:
+        affected = _select_ids(c, task_ids)
+        c.executemany(f'''
+            UPDATE tasks 
+            SET status = 'Done', completed_at = ?, completed_date = ?,
+                completed_hour = ?, hidden = NULL,
+                {_SET_DURATIONS}
+            WHERE id = ?
+        ''', [(now, day, hour, now, now, task_id) for task_id in affected])
+    if affected:
+        publish("task", UPDATED, affected)
+    return affected
+
+@writes("tasks", "task_durations")
+def delete_many(task_ids):
+    """Permanently delete many tasks (archived ones too) in one transaction"""
+    task_ids = list(task_ids)
+    conn = get_connection(DB_FILE)
+    with write_transaction(conn) as c:
+        affected = _select_ids(c, task_ids)
+        c.executemany('DELETE FROM tasks WHERE id = ?', [(task_id,) for task_id in affected])
+        archived = _select_ids(c, set(task_ids) - set(affected), table="tasks_archive")
+        c.executemany('DELETE FROM tasks_archive WHERE id = ?', [(task_id,) for task_id in archived])
+        affected += archived
+    if affected:
+        publish("task", DELETED, affected)
+    return affected
+
+@writes("tasks")
+def start_many(task_ids):
+    """Record a start time for many tasks (ones already started are skipped)"""
+    conn = get_connection(DB_FILE)
+    now, day, hour = _local_now()
+    with write_transaction(conn) as c:
+        affected = _select_ids(c, task_ids, "started_at IS NULL")
+        c.executemany('''
+            UPDATE tasks 
+            SET started_at = ?, started_date = ?, started_hour = ?
+            WHERE id = ?
+        ''', [(now, day, hour, task_id) for task_id in affected])
+    if affected:
+        publish("task", UPDATED, affected)
+    return affected
 
 # ============================================================================
 # HIDDEN TASKS FUNCTIONS
 # ============================================================================
 
+@writes("tasks")
 def hide_incomplete_tasks():
     """PERMANENTLY hide all incomplete tasks from main view
     Called by refresh button
-    """
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
-    c.execute('''
-        UPDATE tasks 
-        SET hidden = 1 
-        WHERE status != 'Done' AND hidden = 0
-    ''')
     
-    affected = c.rowcount
-    conn.commit()
-    conn.close()
+    Only the watermark moves (up to the newest task) and the few per-task
+    overrides are cleared, so the write costs the same for any backlog.
+    The count is read before the write lock is taken - a task added in
+    between is hidden but not counted.
+    """
+    conn = get_connection(DB_FILE)
+    affected = conn.execute(f"SELECT COUNT(*) FROM {_VISIBLE_TASKS}").fetchone()[0]
+    if affected:
+        with write_transaction(conn) as c:
+            c.execute('''
+                UPDATE settings SET value = (SELECT COALESCE(MAX(id), 0) FROM tasks)
+                WHERE key = 'hide_watermark'
+            ''')
+            c.execute("UPDATE tasks SET hidden = NULL WHERE status != 'Done' AND hidden IS NOT NULL")
     
     print(f"[Database] Permanently hidden {affected} tasks")
+    if affected:
+        publish("task", HIDDEN, count=affected)
     return affected
 
+@writes("tasks")
 def unhide_all_tasks():
-    """Show ALL tasks again (set hidden=0 for all)
+    """Show ALL tasks again (watermark back to 0, overrides cleared)
     Called by "Show All Tasks" button
-    """
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
     
-    c.execute('UPDATE tasks SET hidden = 0')
-    affected = c.rowcount
-    
-    conn.commit()
-    conn.close()
+    Returns:
+        int: Number of tasks that were hidden (counted before the write
+             lock is taken, so the write stays constant-time)
+    """
+    conn = get_connection(DB_FILE)
+    affected = _count_hidden(conn.cursor())
+    with write_transaction(conn) as c:
+        c.execute("UPDATE settings SET value = 0 WHERE key = 'hide_watermark'")
+        c.execute("UPDATE tasks SET hidden = NULL WHERE status != 'Done' AND hidden IS NOT NULL")
     
     print(f"[Database] Unhidden {affected} tasks")
+    if affected:
+        publish("task", SHOWN, count=affected)
     return affected
 
+@writes("tasks")
+def set_task_hidden(task_id, hidden=True):
+    """Hide or show one incomplete task, whatever the watermark says
+    
+    Returns:
+        bool: False if the task doesn't exist or is already completed
+    """
+    conn = get_connection(DB_FILE)
+    
+    # Store an override only where it differs from the watermark
+    with write_transaction(conn) as c:
+        c.execute(f'''
+            UPDATE tasks
+            SET hidden = CASE WHEN (id <= {_WATERMARK}) = ? THEN NULL ELSE ? END
+            WHERE id = ? AND status != 'Done'
+        ''', (int(hidden), int(hidden), task_id))
+    
+    if c.rowcount:
+        publish("task", HIDDEN if hidden else SHOWN, (task_id,))
+    return c.rowcount > 0
+
+def _count_hidden(c):
+    # Two index range counts: below the watermark, plus hidden overrides
+    c.execute(f'''
+        SELECT (SELECT COUNT(*) FROM tasks
+                WHERE status != 'Done' AND hidden IS NULL AND id <= {_WATERMARK})
+             + (SELECT COUNT(*) FROM tasks WHERE status != 'Done' AND hidden = 1)
+    ''')
+    return c.fetchone()[0]
+
+@reads("tasks", connect=_connection)
 def get_hidden_count():
     """Get number of hidden incomplete tasks"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('SELECT COUNT(*) FROM tasks WHERE hidden = 1 AND status != "Done"')
-    count = c.fetchone()[0]
-    conn.close()
-    return count
+    conn = get_connection(DB_FILE)
+    return _count_hidden(conn.cursor())
 
+@reads("tasks", connect=_connection)
 def is_task_hidden(task_id):
     """Check if a specific task is hidden"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection(DB_FILE)
     c = conn.cursor()
-    c.execute('SELECT hidden FROM tasks WHERE id = ?', (task_id,))
+    c.execute(f"SELECT status != 'Done' AND {_HIDDEN_CONDITION} FROM tasks WHERE id = ?", (task_id,))
     result = c.fetchone()
-    conn.close()
-    return result and result[0] == 1
+    return bool(result and result[0])
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+SEARCH_LIMIT = 20
+
+_search_row = record_factory(SearchResult)
+
+def _fts_query(text):
+    """Turn free text into a safe FTS5 query
+
+    Every word is quoted, so characters like - or : are matched literally
+    instead of being read as query syntax, and the last word matches as a
+    prefix so results appear while the user is still typing.
+    """
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if not words:
+        return None
+    words[-1] += "*"
+    return " ".join(words)
+
+def _has_search_index(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+    ).fetchone() is not None
+
+@reads("tasks", "plans", connect=_connection)
+def search_tasks(query, limit=SEARCH_LIMIT):
+    """Full-text search over task titles/descriptions and plan headings/descriptions
+
+    Returns up to `limit` SearchResult records, best match first. Title and
+    heading hits rank above description hits.
+    """
+    match = _fts_query(query)
+    if match is None:
+        return []
+
+    conn = get_connection(DB_FILE)
+    c = conn.cursor()
+    c.row_factory = _search_row
+
+    if not _has_search_index(conn):
+        # SQLite without FTS5: plain substring match, newest first
+        pattern = "%" + " ".join(query.split()) + "%"
+        c.execute('''
+            SELECT 'task' AS kind, id, title, COALESCE(d.description, '') AS snippet,
+                   status, 0.0 AS rank
+            FROM all_tasks LEFT JOIN task_descriptions d ON d.task_id = all_tasks.id
+            WHERE title LIKE ? OR d.description LIKE ?
+            UNION ALL
+            SELECT 'plan', id, heading, COALESCE(description, ''), status, 0.0
+            FROM plans WHERE heading LIKE ? OR description LIKE ?
+            ORDER BY id DESC LIMIT ?
+        ''', (pattern, pattern, pattern, pattern, limit))
+        return c.fetchall()
+
+    # Archived tasks keep their index entries; look them up by id in
+    # whichever table holds the row (a join on the all_tasks view can't)
+    c.execute('''
+        SELECT 'task' AS kind, tasks_fts.rowid AS id, tasks_fts.title AS title,
+               snippet(tasks_fts, -1, '[', ']', '...', 12) AS snippet,
+               COALESCE(t.status, a.status) AS status, bm25(tasks_fts, 10.0, 1.0) AS rank
+        FROM tasks_fts
+        LEFT JOIN tasks t ON t.id = tasks_fts.rowid
+        LEFT JOIN tasks_archive a ON a.id = tasks_fts.rowid
+        WHERE tasks_fts MATCH ?
+        UNION ALL
+        SELECT 'plan', p.id, p.heading,
+               snippet(plans_fts, -1, '[', ']', '...', 12),
+               p.status, bm25(plans_fts, 10.0, 1.0)
+        FROM plans_fts JOIN plans p ON p.id = plans_fts.rowid
+        WHERE plans_fts MATCH ?
+        ORDER BY rank LIMIT ?
+    ''', (match, match, limit))
+    return c.fetchall()
 
 # ============================================================================
 # TIME TRACKING FUNCTIONS
 # ============================================================================
 
 def get_task_duration(task):
-    """Calculate duration for a task
-    Task format: (id, title, description, status, category, priority, created_at, started_at, completed_at, hidden)
+    """Duration in minutes for a Task record (needs status and
+    duration_seconds, or created_at and completed_at, loaded)
     """
-    if task[3] != "Done" or not task[6] or not task[8]:
+    if task.status != "Done":
         return None
+    if task.duration_seconds is not None:
+        return task.duration_seconds / 60
     
-    try:
-        created = datetime.fromisoformat(task[6])
-        completed = datetime.fromisoformat(task[8])
-        duration = (completed - created).total_seconds() / 60  # in minutes
-        return duration
-    except:
+    # Records loaded without the stored column
+    if task.created_at is None or task.completed_at is None:
         return None
+    return (task.completed_at - task.created_at) / 60
 
 def format_duration(minutes):
     """Format minutes into readable string"""
@@ -250,41 +627,49 @@ def format_duration(minutes):
 # STATISTICS FUNCTIONS
 # ============================================================================
 
+@reads("tasks", connect=_connection)
 def get_task_statistics():
-    """Get overall task statistics"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
-    # Total tasks
-    c.execute('SELECT COUNT(*) FROM tasks')
-    total = c.fetchone()[0]
+    """Get overall task statistics in a single pass over tasks
     
-    # Completed tasks
-    c.execute('SELECT COUNT(*) FROM tasks WHERE status = "Done"')
-    completed = c.fetchone()[0]
+    Returns:
+        dict: overall totals plus 'by_category' and 'by_priority' breakdowns,
+              each mapping a name to {'total', 'completed', 'pending'}
+    """
+    conn = get_connection(DB_FILE)
+    c = conn.cursor()
     
-    # Pending tasks (visible + hidden)
-    c.execute('SELECT COUNT(*) FROM tasks WHERE status != "Done"')
-    pending = c.fetchone()[0]
+    c.execute('''
+        SELECT
+            COALESCE(category, 'General'),
+            COALESCE(priority, 'Medium'),
+            COUNT(*),
+            SUM(CASE WHEN status = 'Done' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status != 'Done' THEN 1 ELSE 0 END),
+            COUNT(duration_seconds),
+            SUM(duration_seconds) / 60.0
+        FROM all_tasks
+        GROUP BY 1, 2
+    ''')
     
-    # Tasks with duration data
-    c.execute('SELECT COUNT(*) FROM tasks WHERE status = "Done" AND completed_at IS NOT NULL AND created_at IS NOT NULL')
-    tasks_with_duration = c.fetchone()[0]
+    total = completed = pending = tasks_with_duration = 0
+    total_minutes = 0
+    by_category = {}
+    by_priority = {}
     
-    # Average completion time
-    if tasks_with_duration > 0:
-        c.execute('''
-            SELECT AVG(
-                (julianday(completed_at) - julianday(created_at)) * 24 * 60
-            ) FROM tasks 
-            WHERE status = "Done" AND completed_at IS NOT NULL AND created_at IS NOT NULL
-        ''')
-        avg_time = c.fetchone()[0] or 0
-    else:
-        avg_time = 0
-    
-    conn.close()
+    for category, priority, n, n_done, n_pending, n_timed, minutes in c.fetchall():
+        total += n
+        completed += n_done
+        pending += n_pending
+        tasks_with_duration += n_timed
+        total_minutes += minutes or 0
+        
+        for breakdown, key in ((by_category, category), (by_priority, priority)):
+            entry = breakdown.setdefault(key, {'total': 0, 'completed': 0, 'pending': 0})
+            entry['total'] += n
+            entry['completed'] += n_done
+            entry['pending'] += n_pending
     
+    avg_time = total_minutes / tasks_with_duration if tasks_with_duration > 0 else 0
     completion_rate = (completed / total * 100) if total > 0 else 0
     
     return {
@@ -293,33 +678,100 @@ def get_task_statistics():
         'pending': pending,
         'completion_rate': completion_rate,
         'tasks_with_duration': tasks_with_duration,
-        'avg_completion_time': avg_time
+        'avg_completion_time': avg_time,
+        'by_category': by_category,
+        'by_priority': by_priority
     }
 
-def get_daily_performance():
-    """Get today's performance stats"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    today = datetime.now().date().isoformat()
+def _duration_percentiles(c, column, percentiles):
+    """Nearest-rank percentiles of a stored duration column, in minutes
+    
+    Each one reads the column's partial indexes on tasks and tasks_archive
+    merged in order (no sort), but OFFSET still walks rank entries - O(n).
+    """
+    c.execute(f'''
+        SELECT (SELECT COUNT(*) FROM tasks WHERE {column} IS NOT NULL)
+             + (SELECT COUNT(*) FROM tasks_archive WHERE {column} IS NOT NULL)
+    ''')
+    n = c.fetchone()[0]
+    result = {}
+    for p in percentiles:
+        if n == 0:
+            result[p] = None
+            continue
+        rank = min(n, max(1, -(-p * n // 100)))  # ceil(p/100 * n)
+        c.execute(
+            f"SELECT {column} FROM all_tasks WHERE {column} IS NOT NULL ORDER BY {column} LIMIT 1 OFFSET ?",
+            (rank - 1,)
+        )
+        result[p] = c.fetchone()[0] / 60
+    return result
+
+# Durations only change when a task is completed or deleted for good, so
+# percentiles stay cached through adds, starts, hiding and archiving
+@reads("task_durations", connect=_connection)
+def get_duration_percentiles(percentiles=(50, 75, 90), active=False):
+    """Completion-time percentiles in minutes, e.g. {50: 42.0, 90: 180.5}
+    
+    Args:
+        percentiles: Percentiles to return (1-100)
+        active (bool): Use time since the task was started instead of created
+    """
+    conn = get_connection(DB_FILE)
+    column = "active_seconds" if active else "duration_seconds"
+    return _duration_percentiles(conn.cursor(), column, tuple(percentiles))
+
+def _range_totals(c, start_str, end_str):
+    """Created/completed counts and minutes for a date range from daily_stats"""
+    c.execute('''
+        SELECT COALESCE(SUM(created), 0), COALESCE(SUM(completed), 0),
+               COALESCE(SUM(total_minutes), 0)
+        FROM daily_stats
+        WHERE day BETWEEN ? AND ?
+    ''', (start_str, end_str))
+    return c.fetchone()
+
+@reads("tasks", "daily_stats", connect=_connection)
+def get_range_performance(start_date, end_date):
+    """Get performance stats for any date range (inclusive)
+    
+    Reads the daily_stats rollup, so the cost depends on the number of days
+    in the range rather than the number of tasks.
     
-    # Tasks created today
-    c.execute('SELECT COUNT(*) FROM tasks WHERE date(created_at) = ?', (today,))
-    created = c.fetchone()[0]
+    Returns:
+        dict: totals plus a per-category breakdown
+    """
+    conn = get_connection(DB_FILE)
+    c = conn.cursor()
+    start_str = start_date.isoformat()
+    end_str = end_date.isoformat()
     
-    # Tasks completed today
-    c.execute('SELECT COUNT(*) FROM tasks WHERE date(completed_at) = ?', (today,))
-    completed = c.fetchone()[0]
+    created, completed, total_time = _range_totals(c, start_str, end_str)
     
-    # Total time spent today
     c.execute('''
-        SELECT SUM(
-            (julianday(completed_at) - julianday(created_at)) * 24 * 60
-        ) FROM tasks 
-        WHERE date(completed_at) = ? AND completed_at IS NOT NULL AND created_at IS NOT NULL
-    ''', (today,))
-    total_time = c.fetchone()[0] or 0
+        SELECT category, SUM(created), SUM(completed), SUM(total_minutes)
+        FROM daily_stats
+        WHERE day BETWEEN ? AND ?
+        GROUP BY category
+        ORDER BY SUM(completed) DESC, category
+    ''', (start_str, end_str))
+    by_category = {
+        category: {'created': cat_created, 'completed': cat_completed, 'total_time_minutes': minutes}
+        for category, cat_created, cat_completed, minutes in c.fetchall()
+        if cat_created or cat_completed
+    }
     
-    conn.close()
+    return {
+        'total_created': created,
+        'total_completed': completed,
+        'total_time_minutes': total_time,
+        'by_category': by_category
+    }
+
+def _daily_performance(c, today):
+    """Today's performance stats, read through cursor c"""
+    today = today.isoformat()
+    created, completed, total_time = _range_totals(c, today, today)
     
     return {
         'total_created': created,
@@ -327,50 +779,25 @@ def get_daily_performance():
         'total_time_minutes': total_time
     }
 
-def get_weekly_performance():
-    """Get this week's performance stats"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
+def _weekly_performance(c, today):
+    """This week's performance stats, read through cursor c"""
     # Get start of week (Monday)
-    today = datetime.now().date()
     start_of_week = today - timedelta(days=today.weekday())
     end_of_week = start_of_week + timedelta(days=6)
     
     start_str = start_of_week.isoformat()
     end_str = end_of_week.isoformat()
     
-    # Tasks created this week
-    c.execute('''
-        SELECT COUNT(*) FROM tasks 
-        WHERE date(created_at) BETWEEN ? AND ?
-    ''', (start_str, end_str))
-    created = c.fetchone()[0]
-    
-    # Tasks completed this week
-    c.execute('''
-        SELECT COUNT(*) FROM tasks 
-        WHERE date(completed_at) BETWEEN ? AND ?
-    ''', (start_str, end_str))
-    completed = c.fetchone()[0]
-    
-    # Total time spent this week
-    c.execute('''
-        SELECT SUM(
-            (julianday(completed_at) - julianday(created_at)) * 24 * 60
-        ) FROM tasks 
-        WHERE date(completed_at) BETWEEN ? AND ?
-        AND completed_at IS NOT NULL AND created_at IS NOT NULL
-    ''', (start_str, end_str))
-    total_time = c.fetchone()[0] or 0
+    created, completed, total_time = _range_totals(c, start_str, end_str)
     
     # Most productive day
     c.execute('''
-        SELECT date(completed_at), COUNT(*) 
-        FROM tasks 
-        WHERE date(completed_at) BETWEEN ? AND ?
-        GROUP BY date(completed_at)
-        ORDER BY COUNT(*) DESC
+        SELECT day, SUM(completed)
+        FROM daily_stats
+        WHERE day BETWEEN ? AND ?
+        GROUP BY day
+        HAVING SUM(completed) > 0
+        ORDER BY SUM(completed) DESC
         LIMIT 1
     ''', (start_str, end_str))
     result = c.fetchone()
@@ -380,8 +807,6 @@ def get_weekly_performance():
         # Convert to day name - FIXED: removed duplicate import
         most_productive = datetime.fromisoformat(most_productive).strftime("%A")
     
-    conn.close()
-    
     return {
         'total_created': created,
         'total_completed': completed,
@@ -391,12 +816,8 @@ def get_weekly_performance():
         'week_end': end_of_week.strftime("%b %d")
     }
 
-def get_monthly_performance():
-    """Get this month's performance stats"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
-    today = datetime.now().date()
+def _monthly_performance(c, today):
+    """This month's performance stats, read through cursor c"""
     start_of_month = today.replace(day=1)
     
     # Get last day of month
@@ -408,35 +829,22 @@ def get_monthly_performance():
     start_str = start_of_month.isoformat()
     end_str = end_of_month.isoformat()
     
-    # Tasks created this month
-    c.execute('''
-        SELECT COUNT(*) FROM tasks 
-        WHERE date(created_at) BETWEEN ? AND ?
-    ''', (start_str, end_str))
-    created = c.fetchone()[0]
-    
-    # Tasks completed this month
-    c.execute('''
-        SELECT COUNT(*) FROM tasks 
-        WHERE date(completed_at) BETWEEN ? AND ?
-    ''', (start_str, end_str))
-    completed = c.fetchone()[0]
+    created, completed, _ = _range_totals(c, start_str, end_str)
     
     # Best week (simplified - week with most completions)
     c.execute('''
-        SELECT strftime('%W', completed_at) as week_num, COUNT(*) 
-        FROM tasks 
-        WHERE date(completed_at) BETWEEN ? AND ?
+        SELECT strftime('%W', day) as week_num, SUM(completed)
+        FROM daily_stats
+        WHERE day BETWEEN ? AND ?
         GROUP BY week_num
-        ORDER BY COUNT(*) DESC
+        HAVING SUM(completed) > 0
+        ORDER BY SUM(completed) DESC
         LIMIT 1
     ''', (start_str, end_str))
     result = c.fetchone()
     
     best_week = f"Week {result[0]}" if result else None
     
-    conn.close()
-    
     completion_rate = (completed / created * 100) if created > 0 else 0
     
     return {
@@ -446,30 +854,365 @@ def get_monthly_performance():
         'best_week': best_week
     }
 
+@writes("daily_stats")
+def rebuild_daily_stats():
+    """Recompute the daily_stats rollup from scratch (for repairs/imports)"""
+    conn = get_connection(DB_FILE)
+    with conn:
+        fill_daily_stats(conn)
+    count = conn.execute("SELECT COUNT(*) FROM daily_stats").fetchone()[0]
+    print(f"[Database] Rebuilt daily_stats: {count} rows")
+    return count
+
+def _streak_info(c, today):
+    """Current and longest streaks of days with at least one completion
+
+    One gaps-and-islands pass over the days with completions: consecutive
+    days share the same (day - row_number) value, so each group is a streak.
+
+    Returns:
+        dict: current, current_start, longest, longest_start
+              (start dates are ISO strings, None when there is no streak)
+    """
+    today = today.isoformat()
+    
+    c.execute('''
+        WITH days AS (
+            SELECT day
+            FROM daily_stats
+            GROUP BY day
+            HAVING SUM(completed) > 0
+        ),
+        islands AS (
+            SELECT day, julianday(day) - ROW_NUMBER() OVER (ORDER BY day) AS island
+            FROM days
+        )
+        SELECT MIN(day), MAX(day), COUNT(*)
+        FROM islands
+        GROUP BY island
+    ''')
+    
+    current, current_start = 0, None
+    longest, longest_start = 0, None
+    for start, end, length in c.fetchall():
+        # The current streak must include today
+        if end == today:
+            current, current_start = length, start
+        if length > longest or (length == longest and start > longest_start):
+            longest, longest_start = length, start
+    
+    return {
+        'current': current,
+        'current_start': current_start,
+        'longest': longest,
+        'longest_start': longest_start
+    }
+
+def get_daily_performance():
+    """Get today's performance stats"""
+    return _daily_performance(get_connection(DB_FILE).cursor(), _today())
+
+def get_weekly_performance():
+    """Get this week's performance stats"""
+    return _weekly_performance(get_connection(DB_FILE).cursor(), _today())
+
+def get_monthly_performance():
+    """Get this month's performance stats"""
+    return _monthly_performance(get_connection(DB_FILE).cursor(), _today())
+
+def get_streak_info():
+    """Get current and longest completion streaks (see _streak_info)"""
+    return _streak_info(get_connection(DB_FILE).cursor(), _today())
+
 def get_completion_streak():
     """Get current streak of days with at least one completion"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+    return get_streak_info()['current']
+
+# ============================================================================
+# ARCHIVE
+# ============================================================================
+# Completed tasks older than archive_after_days move from tasks to
+# tasks_archive, so the hot table only holds the open backlog and recent
+# history however old the account is. History and statistics read the
+# all_tasks view over both tables; daily_stats and the search index keep
+# archived tasks (the triggers only forget a task when it is deleted).
+
+ARCHIVE_BATCH = 500  # Tasks moved per transaction, so other writers never wait long
+
+def get_archive_age():
+    """Days after completion before a task is archived (0 = never)"""
+    conn = get_connection(DB_FILE)
+    row = conn.execute("SELECT value FROM settings WHERE key = 'archive_after_days'").fetchone()
+    return row[0] if row else 0
+
+def set_archive_age(days):
+    """Change how many days completed tasks stay in the hot table (0 = never archive)"""
+    if days < 0:
+        raise ValueError("Archive age must be 0 or more days")
+    conn = get_connection(DB_FILE)
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES ('archive_after_days', ?)",
+            (int(days),)
+        )
+
+@writes("tasks")
+def archive_completed_batch(older_than_days=None, limit=ARCHIVE_BATCH):
+    """Move up to `limit` old completed tasks to tasks_archive in one transaction
     
-    streak = 0
-    check_date = datetime.now().date()
+    Args:
+        older_than_days: Completion age to archive at (default: get_archive_age())
+        limit (int): Most tasks to move
     
+    Returns:
+        int: Tasks moved - fewer than limit means nothing is left to archive
+    """
+    if older_than_days is None:
+        older_than_days = get_archive_age()
+    if not older_than_days:
+        return 0
+    cutoff = (_today() - timedelta(days=older_than_days)).isoformat()
+    
+    conn = get_connection(DB_FILE)
+    with write_transaction(conn) as c:
+        c.execute('''
+            SELECT id FROM tasks
+            WHERE completed_date < ? AND status = 'Done'
+            ORDER BY completed_date LIMIT ?
+        ''', (cutoff, limit))
+        ids = [row[0] for row in c.fetchall()]
+        if ids:
+            placeholders = ",".join("?" * len(ids))
+            cols = ", ".join(_ROW_COLUMNS)
+            # Copy first: the delete triggers skip rows already in the archive
+            c.execute(f"INSERT INTO tasks_archive ({cols}) SELECT {cols} FROM tasks WHERE id IN ({placeholders})", ids)
+            c.execute(f"DELETE FROM tasks WHERE id IN ({placeholders})", ids)
+    
+    # Nothing anyone sees changes (all_tasks still has the rows), so no event
+    return len(ids)
+
+def archive_completed_tasks(older_than_days=None, batch_size=ARCHIVE_BATCH):
+    """Archive every old completed task, one short transaction per batch
+    
+    Returns:
+        int: Total tasks moved
+    """
+    total = 0
     while True:
-        date_str = check_date.isoformat()
-        c.execute('SELECT COUNT(*) FROM tasks WHERE date(completed_at) = ?', (date_str,))
-        count = c.fetchone()[0]
-        
-        if count > 0:
-            streak += 1
-            check_date -= timedelta(days=1)
-        else:
+        moved = archive_completed_batch(older_than_days, batch_size)
+        total += moved
+        if moved < batch_size:
             break
+    if total:
+        print(f"[Database] Archived {total} completed tasks")
+    return total
+
+# ============================================================================
+# ANALYTICS SNAPSHOT
+# ============================================================================
+
+class AnalyticsSnapshot(NamedTuple):
+    """Every progress-window number, read at one instant (immutable)"""
+    taken_at: datetime
+    daily: Mapping
+    weekly: Mapping
+    monthly: Mapping
+    streak: Mapping
+
+def get_analytics_snapshot():
+    """Read daily, weekly, monthly and streak stats in one read transaction
     
-    conn.close()
-    return streak
+    All four reports see the same database state, even if another process
+    writes in between, and share a single connection.
+    """
+    conn = get_connection(DB_FILE)
+    c = conn.cursor()
+    now = datetime.now()
+    today = _today()
+    
+    # In WAL mode the first read pins the snapshot until COMMIT
+    owns_transaction = not conn.in_transaction
+    if owns_transaction:
+        c.execute("BEGIN")
+    try:
+        snapshot = AnalyticsSnapshot(
+            taken_at=now,
+            daily=MappingProxyType(_daily_performance(c, today)),
+            weekly=MappingProxyType(_weekly_performance(c, today)),
+            monthly=MappingProxyType(_monthly_performance(c, today)),
+            streak=MappingProxyType(_streak_info(c, today))
+        )
+    finally:
+        if owns_transaction:
+            conn.commit()
+    return snapshot
+
+# ============================================================================
+# QUERY PLAN CHECK
+# ============================================================================
+
+# Rollup tables hold one row per day (and category), so scanning them is cheap
+ROLLUP_TABLES = {"daily_stats"}
+
+# Read paths that run on every refresh or analytics view
+HOT_QUERIES = [
+    ("list_tasks", lambda: list_tasks()),
+    ("list_tasks(include_hidden)", lambda: list_tasks(include_hidden=True)),
+    ("list_tasks_page", lambda: list_tasks_page(before_id=1000)),
+    ("get_unfinished_tasks", lambda: get_unfinished_tasks()),
+    ("get_hidden_count", lambda: get_hidden_count()),
+    ("is_task_hidden", lambda: is_task_hidden(1)),
+    ("get_daily_performance", lambda: get_daily_performance()),
+    ("get_weekly_performance", lambda: get_weekly_performance()),
+    ("get_monthly_performance", lambda: get_monthly_performance()),
+    ("get_completion_streak", lambda: get_completion_streak()),
+    ("get_analytics_snapshot", lambda: get_analytics_snapshot()),
+    ("get_range_performance", lambda: get_range_performance(
+        _today() - timedelta(days=90), _today())),
+    ("search_tasks", lambda: search_tasks("report")),
+    ("get_duration_percentiles", lambda: get_duration_percentiles()),
+    ("get_duration_percentiles(active)", lambda: get_duration_percentiles(active=True)),
+]
+
+def check_query_plans():
+    """EXPLAIN every statement the hot read paths execute.
+
+    A query fails when SQLite plans a SCAN over a whole table or a full
+    index; scans of partial indexes only touch the rows they cover and are
+    allowed, as are scans of the small per-day rollup tables and FTS5
+    lookups (which SQLite reports as a scan of the virtual table).
+    Returns a list of (name, sql, plan_line) failures.
+    """
+    conn = get_connection(DB_FILE)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    partial = {
+        row[1] for table in ("tasks", "plans")
+        for row in conn.execute(f"PRAGMA index_list({table})") if row[4]
+    }
+
+    failures = []
+    for name, run in HOT_QUERIES:
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            # Cached results would skip the SQL we want to see
+            with cache.disabled():
+                run()
+        finally:
+            conn.set_trace_callback(None)
+
+        for sql in dict.fromkeys(statements):
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            for row in conn.execute("EXPLAIN QUERY PLAN " + sql):
+                detail = row[3]
+                if not detail.startswith("SCAN "):
+                    continue
+                words = detail.split()
+                if words[1] not in tables or words[1] in ROLLUP_TABLES:
+                    continue
+                if "VIRTUAL TABLE" in detail:
+                    continue
+                if "INDEX" in words and words[words.index("INDEX") + 1] in partial:
+                    continue
+                failures.append((name, " ".join(sql.split()), detail))
+    return failures
 
 # ============================================================================
 # INITIALIZE DATABASE ON IMPORT
 # ============================================================================
 
-create_table()
\ No newline at end of file
+create_table()
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+def _check_concurrent_access(seconds=3, seed_tasks=2000, max_write_ms=250):
+    """GUI-style analytics reads while a separate CLI-style process writes.
+
+    Runs against a throwaway database. Returns True when no reader or
+    writer hit "database is locked" and no write stalled behind readers.
+    """
+    import os
+    import subprocess
+    import sys
+    import tempfile
+    import threading
+    import time
+
+    global DB_FILE
+    original_db = DB_FILE
+    tmp_dir = tempfile.mkdtemp(prefix="tasky_wal_")
+    DB_FILE = os.path.join(tmp_dir, "tasks.db")
+
+    try:
+        create_table()
+        for i in range(seed_tasks):
+            add_task(f"Seed task {i}", category="Work")
+
+        errors = []
+        reads = [0]
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    get_weekly_performance()
+                    get_daily_performance()
+                    reads[0] += 1
+                except Exception as e:
+                    errors.append(f"reader: {e}")
+
+        # Writer runs in its own process, exactly like `main.py add`
+        writer_code = (
+            "import sys, time; sys.path.insert(0, sys.argv[1]); import tasks\n"
+            "end = time.time() + float(sys.argv[2]); n = 0; worst = 0\n"
+            "while time.time() < end:\n"
+            "    t = time.perf_counter()\n"
+            "    tasks.mark_done(tasks.add_task('CLI task')); n += 1\n"
+            "    worst = max(worst, time.perf_counter() - t)\n"
+            "print(n, int(worst * 1000))\n"
+        )
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for t in readers:
+            t.start()
+
+        started = time.time()
+        writer = subprocess.run(
+            [sys.executable, "-c", writer_code,
+             os.path.dirname(os.path.abspath(__file__)), str(seconds)],
+            cwd=tmp_dir, capture_output=True, text=True
+        )
+        elapsed = time.time() - started
+        stop.set()
+        for t in readers:
+            t.join()
+
+        if writer.returncode != 0:
+            errors.append(f"writer: {writer.stderr.strip().splitlines()[-1]}")
+        writes, worst_ms = map(int, (writer.stdout.strip().splitlines() or ["0 0"])[-1].split())
+        if worst_ms > max_write_ms:
+            errors.append(f"writer: a write waited {worst_ms} ms for readers")
+
+        print(f"[WAL check] {reads[0]} analytics reads, {writes} CLI writes in {elapsed:.1f}s "
+              f"(slowest write {worst_ms} ms)")
+        for err in errors[:5]:
+            print(f"[WAL check] ERROR {err}")
+        return not errors
+    finally:
+        DB_FILE = original_db
+
+if __name__ == "__main__":
+    import sys
+
+    print("=== Tasks Database Test ===")
+    ok = _check_concurrent_access()
+    print("✓ Concurrent reads and writes OK" if ok else "✗ Concurrent access failed")
+
+    failures = check_query_plans()
+    for name, sql, detail in failures:
+        print(f"[Query plan] {name}: {detail}\n    {sql}")
+    print("✓ Hot queries use indexes" if not failures else "✗ Hot queries fall back to SCAN")
+
+    sys.exit(0 if ok and not failures else 1)
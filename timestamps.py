@@ -0,0 +1,76 @@
+# timestamps.py - Epoch-second timestamps and the database timezone
+# Every *_at column stores whole seconds since 1970-01-01 UTC as an INTEGER,
+# so durations are a subtraction and range filters are integer comparisons.
+# The local calendar day/hour columns next to them are worked out in the
+# timezone recorded once per database (settings.timezone).
+#
+#   ts, day, hour = local_parts(tz)
+#   started = to_local(task.started_at, tz)
+
+import os
+import time
+from datetime import datetime
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+LOCAL = "local"  # Recorded when the system zone has no IANA name we can find
+
+# ============================================================================
+# CONVERSIONS
+# ============================================================================
+
+def now():
+    """Current time in epoch seconds"""
+    return int(time.time())
+
+def to_epoch(dt):
+    """Epoch seconds for a datetime (naive ones are read as local time)"""
+    return int(dt.timestamp())
+
+def to_local(ts, tz=None):
+    """Naive local datetime for epoch seconds, in tz (None = system zone)"""
+    if tz is None:
+        return datetime.fromtimestamp(ts)
+    return datetime.fromtimestamp(ts, tz).replace(tzinfo=None)
+
+def local_parts(tz=None, ts=None):
+    """(epoch seconds, local ISO date, local hour) for ts, default now"""
+    ts = now() if ts is None else ts
+    local = to_local(ts, tz)
+    return ts, local.date().isoformat(), local.hour
+
+def today(tz=None):
+    """Today's date in tz"""
+    return to_local(now(), tz).date()
+
+# ============================================================================
+# TIMEZONE
+# ============================================================================
+
+def system_timezone_name():
+    """IANA name of this machine's zone (e.g. 'Europe/Berlin'), or LOCAL"""
+    name = os.environ.get("TZ", "").lstrip(":")
+    if name and "/" in name:
+        return name
+    # Unix: /etc/localtime links into the zoneinfo database
+    path = os.path.realpath("/etc/localtime")
+    if "zoneinfo" + os.sep in path:
+        return path.split("zoneinfo" + os.sep, 1)[1]
+    return LOCAL
+
+def get_timezone(name):
+    """tzinfo for a recorded name; None means the system zone
+
+    zoneinfo needs the tzdata package on Windows - without it, dates fall
+    back to the system zone rather than failing.
+    """
+    if not name or name == LOCAL or ZoneInfo is None:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        print(f"[Database] Unknown timezone '{name}' - using the system timezone")
+        return None